@@ -12,15 +12,163 @@ Este módulo implementa la interfaz para análisis estadísticos inferenciales:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from statistical_analysis import StatisticalAnalysis
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from statistical_analysis import StatisticalAnalysis, _json_default
 import json
+import hashlib
+from functools import lru_cache
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# A partir de este número de filas se usa MiniBatchKMeans en lugar de K-means completo
+MINIBATCH_KMEANS_THRESHOLD = 10_000
+
+# Si la razón entre la mayor y la menor varianza es menor que esto, no se estandariza
+COMPARABLE_VARIANCE_RATIO = 4
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _run_kmeans(data_hash, variables, n_clusters, use_minibatch, skip_scaler, _df):
+    """K-means cacheado por (hash de datos, variables, k, variante); _df no se hashea"""
+    analyzer = StatisticalAnalysis()
+    if use_minibatch:
+        return analyzer.minibatch_kmeans_clustering(
+            _df, list(variables), n_clusters, batch_size=1024, n_init=3, skip_scaler=skip_scaler
+        )
+    return analyzer.kmeans_clustering(_df, list(variables), n_clusters, skip_scaler=skip_scaler)
+
+def _has_comparable_scales(df, variables):
+    """True si las variables tienen varianzas del mismo orden (p. ej. ya estandarizadas)"""
+    variances = df[list(variables)].dropna().var().to_numpy(dtype=np.float64)
+    if len(variances) == 0 or not np.all(np.isfinite(variances)) or variances.min() <= 0:
+        return False
+    return variances.max() / variances.min() < COMPARABLE_VARIANCE_RATIO
+
+def _hash_columns(df, columns):
+    """Huella del contenido de las columnas seleccionadas, calculada una sola vez por clic"""
+    arr = np.ascontiguousarray(df[list(columns)].to_numpy(dtype=np.float64))
+    digest = hashlib.blake2b(arr.tobytes(), digest_size=16)
+    digest.update(repr(tuple(columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+@lru_cache(maxsize=32)
+def _excluding(columns, value):
+    """Columnas sin `value`; memoizado para no reconstruir la lista en cada rerun"""
+    return tuple(col for col in columns if col != value)
+
+def get_column_groups(df):
+    """Columnas numéricas, categóricas y de fecha, calculadas una vez por DataFrame cargado
+    
+    Compartido por todos los tabs; quien cambie el tipo de una columna en sitio debe
+    llamar a `invalidate_column_groups()`.
+    """
+    key = (id(df), df.shape)
+    if st.session_state.get('_col_groups_id') != key:
+        st.session_state['_col_groups'] = (
+            df.select_dtypes(include=[np.number]).columns.tolist(),
+            df.select_dtypes(include=['object', 'category', 'string']).columns.tolist(),
+            df.select_dtypes(include=['datetime']).columns.tolist()
+        )
+        st.session_state['_col_groups_id'] = key
+    return st.session_state['_col_groups']
+
+def invalidate_column_groups():
+    """Forzar que las listas de columnas por tipo se recalculen en la próxima consulta"""
+    st.session_state.pop('_col_groups_id', None)
+
+def _compute_group_indices(df, col):
+    """Posiciones de fila por grupo (una sola pasada por la columna)"""
+    pl_df = _get_polars_frame(df) if POLARS_AVAILABLE else None
+    if pl_df is not None:
+        grouped = (
+            pl_df.select(pl.col(col)).with_row_index('__row__')
+            .filter(pl.col(col).is_not_null())
+            .group_by(col, maintain_order=True)
+            .agg(pl.col('__row__'))
+        )
+        return {
+            key: rows.to_numpy().astype(np.intp)
+            for key, rows in zip(grouped.get_column(col).to_list(), grouped.get_column('__row__'))
+        }
+    return df.groupby(col, observed=True, sort=False).indices
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_group_indices(df_hash, col, _df):
+    """Índices por grupo compartidos entre sesiones, solo con huella de contenido; _df no se hashea"""
+    return _compute_group_indices(_df, col)
+
+def _group_indices(df, col):
+    """Índices por grupo del DataFrame cargado
+    
+    Con huella de contenido se usa la caché compartida; sin ella la identidad del objeto
+    no es una clave segura entre sesiones, así que los índices se guardan en la sesión.
+    """
+    df_hash = st.session_state.get('df_hash')
+    if df_hash is not None:
+        return _cached_group_indices(df_hash, col, df)
+    
+    key = (id(df), df.shape)
+    if st.session_state.get('_group_indices_id') != key:
+        st.session_state['_group_indices'] = {}
+        st.session_state['_group_indices_id'] = key
+    cached = st.session_state['_group_indices']
+    if col not in cached:
+        cached[col] = _compute_group_indices(df, col)
+    return cached[col]
+
+def _get_polars_frame(df):
+    """Copia Polars del DataFrame, convertida una vez por archivo cargado (None si no es convertible)"""
+    key = (id(df), df.shape)
+    if st.session_state.get('_polars_df_id') != key:
+        try:
+            st.session_state['_polars_df'] = pl.from_pandas(df)
+        except Exception:
+            st.session_state['_polars_df'] = None
+        st.session_state['_polars_df_id'] = key
+    return st.session_state['_polars_df']
+
+# Entradas del historial de análisis mostradas por página
+HISTORY_PAGE_SIZE = 25
+
+# Máximo de puntos enviados al navegador en los gráficos de dispersión
+SCATTER_POINT_CAP = 5000
+
+# Con más grupos que cap / DOWNSAMPLE_MIN_PER_GROUP el muestreo estratificado ya no
+# conserva proporciones (cada grupo aportaría un solo punto) y se usa uno simple
+DOWNSAMPLE_MIN_PER_GROUP = 10
+
+def maybe_downsample(frame, group_col=None, cap=SCATTER_POINT_CAP):
+    """Submuestrear para graficar; con `group_col` se conservan las proporciones de cada grupo
+    
+    Los valores faltantes de `group_col` forman su propio grupo. Si la columna tiene
+    demasiados valores distintos (p. ej. un identificador) se muestrea sin estratos.
+    """
+    n = len(frame)
+    if n <= cap:
+        return frame
+    
+    rng = np.random.default_rng(0)
+    if group_col is None or frame[group_col].nunique(dropna=False) * DOWNSAMPLE_MIN_PER_GROUP > cap:
+        positions = rng.choice(n, cap, replace=False)
+    else:
+        parts = []
+        grouped = frame.groupby(group_col, sort=False, observed=True, dropna=False)
+        for group_positions in grouped.indices.values():
+            k = min(len(group_positions), max(1, int(round(cap * len(group_positions) / n))))
+            parts.append(rng.choice(group_positions, k, replace=False))
+        positions = np.concatenate(parts)
+    
+    return frame.iloc[np.sort(positions)]
+
 def render_advanced_analysis_tab(df, file_name):
     """Renderizar el tab de análisis avanzados"""
     
@@ -60,6 +208,7 @@ def render_advanced_analysis_tab(df, file_name):
     with subtab5:
         render_analysis_history(stat_analyzer)
 
+@st.fragment
 def render_statistical_tests(df, stat_analyzer):
     """Renderizar pruebas estadísticas"""
     
@@ -89,7 +238,7 @@ def render_statistical_tests(df, stat_analyzer):
         
         # Configuración específica según el tipo de prueba
         if test_type == "t_test_one_sample":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_cols, _, _ = get_column_groups(df)
             if not numeric_cols:
                 st.error("❌ No hay columnas numéricas disponibles")
                 return
@@ -100,12 +249,12 @@ def render_statistical_tests(df, stat_analyzer):
             
             if st.button("🧪 Ejecutar Prueba t (una muestra)", type="primary"):
                 with st.spinner("Realizando análisis..."):
-                    result = stat_analyzer.t_test_one_sample(df, column, test_value, alpha)
+                    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                    result = stat_analyzer.t_test_one_sample(df, column, test_value, alpha, values=values)
                     st.session_state['last_test_result'] = result
         
         elif test_type == "t_test_two_samples":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            numeric_cols, categorical_cols, _ = get_column_groups(df)
             
             if not numeric_cols or not categorical_cols:
                 st.error("❌ Se necesitan columnas numéricas y categóricas")
@@ -115,7 +264,8 @@ def render_statistical_tests(df, stat_analyzer):
             group_column = st.selectbox("Variable de agrupación:", categorical_cols)
             
             # Verificar que la variable de agrupación tenga exactamente 2 grupos
-            unique_groups = df[group_column].nunique()
+            group_indices = _group_indices(df, group_column)
+            unique_groups = len(group_indices)
             if unique_groups != 2:
                 st.warning(f"⚠️ La variable '{group_column}' tiene {unique_groups} grupos. Se necesitan exactamente 2.")
                 return
@@ -125,12 +275,13 @@ def render_statistical_tests(df, stat_analyzer):
             
             if st.button("🧪 Ejecutar Prueba t (dos muestras)", type="primary"):
                 with st.spinner("Realizando análisis..."):
-                    result = stat_analyzer.t_test_two_samples(df, column, group_column, alpha, equal_var)
+                    result = stat_analyzer.t_test_two_samples(
+                        df, column, group_column, alpha, equal_var, group_indices=group_indices
+                    )
                     st.session_state['last_test_result'] = result
         
         elif test_type == "anova_one_way":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            numeric_cols, categorical_cols, _ = get_column_groups(df)
             
             if not numeric_cols or not categorical_cols:
                 st.error("❌ Se necesitan columnas numéricas y categóricas")
@@ -140,7 +291,8 @@ def render_statistical_tests(df, stat_analyzer):
             independent_var = st.selectbox("Variable independiente (categórica):", categorical_cols)
             
             # Verificar que haya al menos 2 grupos
-            unique_groups = df[independent_var].nunique()
+            group_indices = _group_indices(df, independent_var)
+            unique_groups = len(group_indices)
             if unique_groups < 2:
                 st.warning(f"⚠️ La variable '{independent_var}' tiene solo {unique_groups} grupo(s). Se necesitan al menos 2.")
                 return
@@ -149,11 +301,13 @@ def render_statistical_tests(df, stat_analyzer):
             
             if st.button("🧪 Ejecutar ANOVA", type="primary"):
                 with st.spinner("Realizando análisis..."):
-                    result = stat_analyzer.anova_one_way(df, dependent_var, independent_var, alpha)
+                    result = stat_analyzer.anova_one_way(
+                        df, dependent_var, independent_var, alpha, group_indices=group_indices
+                    )
                     st.session_state['last_test_result'] = result
         
         elif test_type == "chi_square_test":
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            _, categorical_cols, _ = get_column_groups(df)
             
             if len(categorical_cols) < 2:
                 st.error("❌ Se necesitan al menos 2 columnas categóricas")
@@ -161,13 +315,18 @@ def render_statistical_tests(df, stat_analyzer):
             
             var1 = st.selectbox("Primera variable categórica:", categorical_cols)
             var2 = st.selectbox("Segunda variable categórica:", 
-                              [col for col in categorical_cols if col != var1])
+                              _excluding(tuple(categorical_cols), var1))
             alpha = st.slider("Nivel de significancia (α):", 0.01, 0.10, 0.05, 0.01)
             
             if st.button("🧪 Ejecutar Chi-cuadrado", type="primary"):
                 with st.spinner("Realizando análisis..."):
                     result = stat_analyzer.chi_square_test(df, var1, var2, alpha)
                     st.session_state['last_test_result'] = result
+            
+            if st.button("🔄 Chi-cuadrado (todas las parejas)"):
+                with st.spinner("Realizando análisis..."):
+                    result = stat_analyzer.chi_square_matrix(df, categorical_cols, alpha)
+                    st.session_state['last_test_result'] = result
     
     with col2:
         st.markdown("#### 📊 Resultados")
@@ -183,6 +342,7 @@ def render_statistical_tests(df, stat_analyzer):
         else:
             st.info("👈 Configura y ejecuta una prueba para ver los resultados aquí")
 
+@st.fragment
 def render_correlation_regression(df, stat_analyzer):
     """Renderizar análisis de correlación y regresión"""
     
@@ -200,7 +360,7 @@ def render_correlation_regression(df, stat_analyzer):
         st.markdown("#### ⚙️ Configuración")
         
         if analysis_type == "correlation":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_cols, _, _ = get_column_groups(df)
             
             if len(numeric_cols) < 2:
                 st.error("❌ Se necesitan al menos 2 columnas numéricas")
@@ -208,7 +368,7 @@ def render_correlation_regression(df, stat_analyzer):
             
             var1 = st.selectbox("Primera variable:", numeric_cols)
             var2 = st.selectbox("Segunda variable:", 
-                              [col for col in numeric_cols if col != var1])
+                              _excluding(tuple(numeric_cols), var1))
             
             method = st.selectbox(
                 "Método de correlación:",
@@ -224,11 +384,12 @@ def render_correlation_regression(df, stat_analyzer):
             
             if st.button("🔗 Calcular Correlación", type="primary"):
                 with st.spinner("Calculando correlación..."):
-                    result = stat_analyzer.correlation_analysis(df, var1, var2, method, alpha)
+                    values = df[[var1, var2]].to_numpy(dtype=np.float64, na_value=np.nan)
+                    result = stat_analyzer.correlation_analysis(df, var1, var2, method, alpha, values=values)
                     st.session_state['last_correlation_result'] = result
         
         elif analysis_type == "regression":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_cols, _, _ = get_column_groups(df)
             
             if len(numeric_cols) < 2:
                 st.error("❌ Se necesitan al menos 2 columnas numéricas")
@@ -237,8 +398,8 @@ def render_correlation_regression(df, stat_analyzer):
             dependent_var = st.selectbox("Variable dependiente (Y):", numeric_cols)
             independent_vars = st.multiselect(
                 "Variables independientes (X):",
-                [col for col in numeric_cols if col != dependent_var],
-                default=[col for col in numeric_cols if col != dependent_var][:1]
+                _excluding(tuple(numeric_cols), dependent_var),
+                default=list(_excluding(tuple(numeric_cols), dependent_var)[:1])
             )
             
             if not independent_vars:
@@ -246,10 +407,24 @@ def render_correlation_regression(df, stat_analyzer):
                 return
             
             alpha = st.slider("Nivel de significancia (α):", 0.01, 0.10, 0.05, 0.01)
+            high_precision = st.checkbox(
+                "🎯 Alta precisión (statsmodels)",
+                value=False,
+                help="Ajuste con statsmodels y su resumen completo"
+            )
             
             if st.button("📈 Ejecutar Regresión", type="primary"):
                 with st.spinner("Ejecutando regresión..."):
-                    result = stat_analyzer.linear_regression(df, dependent_var, independent_vars, alpha)
+                    if high_precision:
+                        result = stat_analyzer.linear_regression(df, dependent_var, independent_vars, alpha)
+                    else:
+                        valid = df[[dependent_var] + independent_vars].dropna()
+                        y = valid[dependent_var].to_numpy(dtype=np.float64)
+                        X = valid[independent_vars].to_numpy(dtype=np.float64)
+                        X = np.column_stack([np.ones(len(X), dtype=np.float64), X])
+                        result = stat_analyzer.linear_regression_fast(
+                            X, y, ['const'] + independent_vars, alpha, dependent_var=dependent_var
+                        )
                     st.session_state['last_regression_result'] = result
     
     with col2:
@@ -266,12 +441,13 @@ def render_correlation_regression(df, stat_analyzer):
         else:
             st.info("👈 Configura y ejecuta un análisis para ver los resultados aquí")
 
+@st.fragment
 def render_clustering_analysis(df, stat_analyzer):
     """Renderizar análisis de clustering"""
     
     st.markdown("### 🎯 Análisis de Clustering")
     
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_cols, _, _ = get_column_groups(df)
     
     if len(numeric_cols) < 2:
         st.error("❌ Se necesitan al menos 2 columnas numéricas para clustering")
@@ -304,7 +480,12 @@ def render_clustering_analysis(df, stat_analyzer):
         if st.button("🎯 Ejecutar Clustering", type="primary"):
             with st.spinner("Ejecutando clustering..."):
                 if method == "kmeans":
-                    result = stat_analyzer.kmeans_clustering(df, variables, n_clusters)
+                    data_hash = _hash_columns(df, variables)
+                    use_minibatch = len(df) > MINIBATCH_KMEANS_THRESHOLD
+                    skip_scaler = _has_comparable_scales(df, variables)
+                    result = _run_kmeans(data_hash, tuple(variables), n_clusters, use_minibatch, skip_scaler, df)
+                    if 'error' not in result:
+                        stat_analyzer.add_to_history(result)
                     st.session_state['last_clustering_result'] = result
                 else:
                     st.info("🚧 Clustering jerárquico en desarrollo")
@@ -318,6 +499,7 @@ def render_clustering_analysis(df, stat_analyzer):
         else:
             st.info("👈 Configura y ejecuta clustering para ver los resultados aquí")
 
+@st.fragment
 def render_analysis_configuration():
     """Renderizar configuración de análisis"""
     
@@ -419,6 +601,7 @@ def render_analysis_configuration():
         else:
             st.info("No hay configuración estadística guardada")
 
+@st.fragment
 def render_analysis_history(stat_analyzer):
     """Renderizar historial de análisis"""
     
@@ -436,52 +619,69 @@ def render_analysis_history(stat_analyzer):
     with col1:
         st.metric("📊 Total de Análisis", len(history))
     
+    # Tipo de cada análisis, calculado una vez y reutilizado en métricas y etiquetas
+    test_types = [item.get('test_type', item.get('analysis_type', 'Desconocido')) for item in history]
+    
     with col2:
-        test_types = [item.get('test_type', item.get('analysis_type', 'Desconocido')) for item in history]
         unique_types = len(set(test_types))
         st.metric("🔬 Tipos de Análisis", unique_types)
     
     with col3:
         if st.button("🗑️ Limpiar Historial"):
             stat_analyzer.clear_history()
+            st.session_state['analysis_history_pages'] = 1
             st.rerun()
     
-    # Mostrar historial detallado
+    # Mostrar historial detallado (paginado, más recientes primero)
     st.markdown("#### 📋 Análisis Realizados")
     
-    for i, analysis in enumerate(reversed(history)):
-        with st.expander(f"📊 {analysis.get('test_type', analysis.get('analysis_type', 'Análisis'))} #{len(history)-i}"):
-            
-            # Información básica
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**Tipo:** " + analysis.get('test_type', analysis.get('analysis_type', 'N/A')))
-                
-                if 'variable' in analysis:
-                    st.markdown(f"**Variable:** {analysis['variable']}")
-                elif 'variables' in analysis:
-                    st.markdown(f"**Variables:** {', '.join(analysis['variables'])}")
-                
-                if 'sample_size' in analysis:
-                    st.markdown(f"**Tamaño de muestra:** {analysis['sample_size']}")
+    pages = st.session_state.setdefault('analysis_history_pages', 1)
+    shown = min(len(history), pages * HISTORY_PAGE_SIZE)
+    
+    for offset in range(shown):
+        number = len(history) - offset
+        _render_history_entry(history[number - 1], test_types[number - 1], number)
+    
+    if shown < len(history):
+        if st.button(f"⬇️ Ver anteriores ({len(history) - shown} restantes)"):
+            st.session_state['analysis_history_pages'] = pages + 1
+            st.rerun()
+
+def _render_history_entry(analysis, test_type, number):
+    """Renderizar una entrada del historial de análisis"""
+    label = test_type if test_type != 'Desconocido' else 'Análisis'
+    with st.expander(f"📊 {label} #{number}"):
+        
+        # Información básica
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Tipo:** " + (test_type if test_type != 'Desconocido' else 'N/A'))
             
-            with col2:
-                if 'p_value' in analysis:
-                    st.markdown(f"**p-valor:** {analysis['p_value']:.4f}")
-                
-                if 'is_significant' in analysis:
-                    significance = "✅ Significativo" if analysis['is_significant'] else "❌ No significativo"
-                    st.markdown(f"**Resultado:** {significance}")
+            if 'variable' in analysis:
+                st.markdown(f"**Variable:** {analysis['variable']}")
+            elif 'variables' in analysis:
+                st.markdown(f"**Variables:** {', '.join(analysis['variables'])}")
             
-            # Interpretación
-            if 'interpretation' in analysis:
-                st.markdown("**Interpretación:**")
-                st.info(analysis['interpretation'])
+            if 'sample_size' in analysis:
+                st.markdown(f"**Tamaño de muestra:** {analysis['sample_size']}")
+        
+        with col2:
+            if 'p_value' in analysis:
+                st.markdown(f"**p-valor:** {analysis['p_value']:.4f}")
             
-            # Botón para exportar resultado
-            if st.button(f"📤 Exportar Análisis #{len(history)-i}", key=f"export_{i}"):
-                export_analysis_result(analysis, len(history)-i)
+            if 'is_significant' in analysis:
+                significance = "✅ Significativo" if analysis['is_significant'] else "❌ No significativo"
+                st.markdown(f"**Resultado:** {significance}")
+        
+        # Interpretación
+        if 'interpretation' in analysis:
+            st.markdown("**Interpretación:**")
+            st.info(analysis['interpretation'])
+        
+        # Botón para exportar resultado
+        if st.button(f"📤 Exportar Análisis #{number}", key=f"export_{number}"):
+            export_analysis_result(analysis, number)
 
 def display_test_results(result):
     """Mostrar resultados de pruebas estadísticas"""
@@ -493,6 +693,10 @@ def display_test_results(result):
     # Información básica
     st.markdown(f"**📊 {result['test_type']}**")
     
+    if 'p_value_matrix' in result:
+        display_chi_square_matrix(result)
+        return
+    
     # Métricas principales
     col1, col2, col3 = st.columns(3)
     
@@ -526,9 +730,50 @@ def display_test_results(result):
     
     elif 'contingency_table' in result:
         st.markdown("**📋 Tabla de Contingencia:**")
-        contingency_df = pd.DataFrame(result['contingency_table'])
+        table = result['contingency_table']
+        contingency_df = pd.DataFrame(table['data'], index=table['index'], columns=table['columns'], copy=False)
         st.dataframe(contingency_df, use_container_width=True)
 
+def display_chi_square_matrix(result):
+    """Mostrar resultados de chi-cuadrado para todas las parejas"""
+    import plotly.graph_objects as go
+    
+    variables = result['variables']
+    
+    if result.get('skipped_variables'):
+        st.info(
+            "ℹ️ Omitidas por número de categorías fuera de rango: "
+            + ", ".join(map(str, result['skipped_variables']))
+        )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Parejas evaluadas", result['n_pairs'])
+    
+    with col2:
+        st.metric("Parejas significativas", len(result['significant_pairs']))
+    
+    st.markdown("**📋 p-valores por pareja:**")
+    p_df = pd.DataFrame(result['p_value_matrix'], index=variables, columns=variables, copy=False)
+    st.dataframe(
+        p_df,
+        use_container_width=True,
+        column_config={col: st.column_config.NumberColumn(format='%.4f') for col in variables}
+    )
+    
+    st.markdown("**🔗 V de Cramer:**")
+    fig = go.Figure(go.Heatmap(
+        z=result['cramers_v_matrix'],
+        x=variables,
+        y=variables,
+        colorscale='Blues',
+        zmin=0,
+        zmax=1
+    ))
+    fig.update_layout(template="plotly_white")
+    st.plotly_chart(fig, use_container_width=True)
+
 def display_correlation_results(result, df):
     """Mostrar resultados de correlación"""
     
@@ -556,22 +801,48 @@ def display_correlation_results(result, df):
     # Gráfico de dispersión
     st.markdown("**📈 Gráfico de Dispersión:**")
     
+    fig = _memoized_render('correlation', result, df, lambda: _build_correlation_figure(result, df))
+    st.plotly_chart(fig, use_container_width=True)
+
+def _build_correlation_figure(result, df):
+    """Construir el gráfico de dispersión con su recta de tendencia"""
+    # Plotly se importa aquí para no pagar su carga al iniciar la app
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
     var1, var2 = result['variable_1'], result['variable_2']
     
     fig = px.scatter(
-        df, 
+        maybe_downsample(df[[var1, var2]]),
         x=var1, 
         y=var2,
         title=f"Correlación entre {var1} y {var2}",
-        trendline="ols"
+        render_mode='webgl'
     )
     
+    # Recta de mínimos cuadrados a partir de medias y desviaciones (sin statsmodels)
+    xy = df[[var1, var2]].dropna().to_numpy(dtype=np.float64)
+    if len(xy) >= 2:
+        x, y = xy[:, 0], xy[:, 1]
+        mx, my, sx, sy = x.mean(), y.mean(), x.std(), y.std()
+        if sx > 0:
+            r = result['correlation_coefficient'] if result.get('method') == 'pearson' else np.corrcoef(x, y)[0, 1]
+            slope = r * sy / sx
+            intercept = my - slope * mx
+            x_line = np.array([x.min(), x.max()])
+            fig.add_trace(go.Scatter(
+                x=x_line,
+                y=intercept + slope * x_line,
+                mode='lines',
+                name='Tendencia (OLS)'
+            ))
+    
     fig.update_layout(
         template="plotly_white",
         title_font_size=16
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_regression_results(result, df):
     """Mostrar resultados de regresión"""
@@ -598,19 +869,21 @@ def display_regression_results(result, df):
     
     # Coeficientes
     st.markdown("**📊 Coeficientes:**")
-    coef_data = []
-    for var, coef in result['coefficients'].items():
-        p_val = result['p_values'][var]
-        ci = result['confidence_intervals'][var]
-        coef_data.append({
-            'Variable': var,
-            'Coeficiente': f"{coef:.4f}",
-            'p-valor': f"{p_val:.4f}",
-            'IC 95%': f"[{ci[0]:.4f}, {ci[1]:.4f}]"
-        })
-    
-    coef_df = pd.DataFrame(coef_data)
-    st.dataframe(coef_df, use_container_width=True)
+    coef_df = _memoized_render('regression', result, df, lambda: pd.DataFrame({
+        'Variable': result['names'],
+        'Coeficiente': result['coefficients_arr'],
+        'p-valor': result['p_values_arr'],
+        'IC 95% inf': result['ci_arr'][:, 0],
+        'IC 95% sup': result['ci_arr'][:, 1]
+    }))
+    st.dataframe(
+        coef_df,
+        use_container_width=True,
+        column_config={
+            col: st.column_config.NumberColumn(format='%.4f')
+            for col in ['Coeficiente', 'p-valor', 'IC 95% inf', 'IC 95% sup']
+        }
+    )
 
 def display_clustering_results(result, df):
     """Mostrar resultados de clustering"""
@@ -633,40 +906,81 @@ def display_clustering_results(result, df):
     
     # Estadísticas por cluster
     st.markdown("**📊 Estadísticas por Cluster:**")
-    cluster_df = pd.DataFrame(result['cluster_statistics'])
-    st.dataframe(cluster_df, use_container_width=True)
+    cluster_df, fig = _memoized_render('clustering', result, df, lambda: _build_clustering_outputs(result))
+    number_config = {'percentage': st.column_config.NumberColumn(format='%.1f%%')}
+    for var in result['variables']:
+        number_config[f'{var}_mean'] = st.column_config.NumberColumn(format='%.4f')
+        number_config[f'{var}_std'] = st.column_config.NumberColumn(format='%.4f')
+    st.dataframe(cluster_df, use_container_width=True, column_config=number_config)
+    
+    if fig is not None:
+        st.markdown("**📈 Visualización de Clusters:**")
+        st.plotly_chart(fig, use_container_width=True)
+
+def _build_clustering_outputs(result):
+    """Construir la tabla por cluster y su gráfico (2 variables directo; más de 2 con PCA)"""
+    import plotly.express as px
     
-    # Visualización de clusters (si hay 2 o 3 variables)
+    cluster_df = pd.DataFrame(result['cluster_statistics'])
     variables = result['variables']
+    fig = None
     
     if len(variables) >= 2:
-        st.markdown("**📈 Visualización de Clusters:**")
-        
-        # Crear DataFrame con clusters
-        cluster_data = pd.DataFrame(result['data_with_clusters'])
-        
         if len(variables) == 2:
+            # Crear DataFrame con clusters
+            cluster_data = maybe_downsample(pd.DataFrame(result['data_with_clusters']), group_col='cluster')
             fig = px.scatter(
                 cluster_data,
                 x=variables[0],
                 y=variables[1],
                 color='cluster',
                 title=f"Clusters: {variables[0]} vs {variables[1]}",
-                color_discrete_sequence=px.colors.qualitative.Set1
+                color_discrete_sequence=px.colors.qualitative.Set1,
+                render_mode='webgl'
             )
         else:
-            fig = px.scatter_3d(
-                cluster_data,
-                x=variables[0],
-                y=variables[1],
-                z=variables[2],
+            pca_data = _cluster_pca_frame(result)
+            fig = px.scatter(
+                maybe_downsample(pca_data, group_col='cluster'),
+                x='PC1',
+                y='PC2',
                 color='cluster',
-                title=f"Clusters 3D: {variables[0]}, {variables[1]}, {variables[2]}",
-                color_discrete_sequence=px.colors.qualitative.Set1
+                title=f"Clusters (proyección PCA de {len(variables)} variables)",
+                color_discrete_sequence=px.colors.qualitative.Set1,
+                render_mode='webgl'
             )
         
         fig.update_layout(template="plotly_white")
-        st.plotly_chart(fig, use_container_width=True)
+    
+    return cluster_df, fig
+
+def _memoized_render(name, result, df, builder):
+    """Reutilizar lo construido por `builder` mientras el resultado y el DataFrame sean los mismos"""
+    key = hash((id(result), id(df)))
+    state_key = f'_rendered_{name}'
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] != key:
+        cached = (key, builder())
+        st.session_state[state_key] = cached
+    return cached[1]
+
+def _cluster_pca_frame(result):
+    """Proyección 2D (PCA) de las variables estandarizadas del clustering, cacheada por resultado"""
+    key = id(result)
+    cached = st.session_state.get('_cluster_pca')
+    if cached is None or cached[0] != key:
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+        # Se recalcula desde las filas del resultado: la matriz escalada no se guarda en el
+        # historial para no inflarlo ni exportarla
+        values = pd.DataFrame(result['data_with_clusters'])[result['variables']].to_numpy(dtype=np.float64)
+        scaled = StandardScaler().fit_transform(values)
+        coords = PCA(n_components=2, svd_solver='randomized', random_state=0).fit_transform(scaled)
+        frame = pd.DataFrame(coords, columns=['PC1', 'PC2'])
+        frame['cluster'] = result['cluster_labels']
+        cached = (key, frame)
+        st.session_state['_cluster_pca'] = cached
+    return cached[1]
 
 def export_analysis_result(analysis, analysis_number):
     """Exportar resultado de análisis"""
@@ -675,8 +989,16 @@ def export_analysis_result(analysis, analysis_number):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"analisis_{analysis_number}_{timestamp}.json"
     
-    # Convertir a JSON
-    analysis_json = json.dumps(analysis, indent=2, default=str, ensure_ascii=False)
+    # Convertir a JSON (orjson serializa escalares/arrays de numpy de forma nativa)
+    if ORJSON_AVAILABLE:
+        analysis_json = orjson.dumps(
+            analysis,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=_json_default
+        )
+    else:
+        # Sin el hook, default=str volcaría los ndarrays como su repr truncado ('[1 2 ... 9]')
+        analysis_json = json.dumps(analysis, indent=2, default=_json_default, ensure_ascii=False)
     
     # Botón de descarga
     st.download_button(
@@ -15,13 +15,64 @@ import numpy as np
 import re
 from datetime import datetime
 import warnings
+from dataclasses import dataclass, asdict
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# A partir de este número de filas las columnas de texto repetitivas se validan como category
+CATEGORICAL_VIEW_MIN_ROWS = 10_000
+
+
+@dataclass(slots=True)
+class Msg:
+    """Mensaje de validación (error, advertencia o sugerencia)"""
+    type: str
+    severity: str
+    message: str
+    suggestion: str
+
+    def __getitem__(self, key):
+        """Acceso estilo diccionario (msg['message']) para el código que ya lo usaba así"""
+        return getattr(self, key)
+
+    def to_dict(self):
+        """Serializar el mensaje a un diccionario compatible con JSON"""
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationSummary:
+    """Resumen de una validación"""
+    total_errors: int
+    total_warnings: int
+    total_suggestions: int
+    is_ready_for_analysis: bool
+    validation_score: int
+
+    def __getitem__(self, key):
+        """Acceso estilo diccionario (summary['validation_score'])"""
+        return getattr(self, key)
+
+    def to_dict(self):
+        """Serializar el resumen a un diccionario compatible con JSON"""
+        return asdict(self)
+
 
 class DataValidator:
+    # YYYY-MM-DD, DD/MM/YYYY, DD-MM-YYYY, YYYY/MM/DD
+    _DATE_RE = re.compile(r'(?:\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}|\d{4}/\d{2}/\d{2})')
+    
     def __init__(self):
         self.validation_results = {}
         self.error_messages = []
         self.warnings = []
         self.suggestions = []
+        self._cache = {}
+        self._numeric_convertible = {}
     
     def validate_dataframe(self, df, file_name="archivo"):
         """Validación completa de un DataFrame"""
@@ -29,9 +80,13 @@ class DataValidator:
         self.error_messages = []
         self.warnings = []
         self.suggestions = []
+        self._numeric_convertible = {}
+        self._cache = {}
+        
+        # Validaciones básicas; si la estructura no es válida el resto no aplica
+        if not self._validate_basic_structure(df, file_name):
+            return self._finalize()
         
-        # Validaciones básicas
-        self._validate_basic_structure(df, file_name)
         self._validate_data_types(df)
         self._validate_missing_values(df)
         self._validate_duplicates(df)
@@ -39,6 +94,10 @@ class DataValidator:
         self._validate_data_consistency(df)
         self._validate_column_names(df)
         
+        return self._finalize()
+    
+    def _finalize(self):
+        """Armar el resultado de la validación"""
         return {
             'is_valid': len(self.error_messages) == 0,
             'errors': self.error_messages,
@@ -47,61 +106,116 @@ class DataValidator:
             'validation_details': self.validation_results
         }
     
+    def _build_cache(self, df):
+        """Precalcular en una pasada por DataFrame lo que consultan los validadores"""
+        nunique = df.nunique(dropna=True)
+        
+        # Los hashes de filas y nulos se calculan sobre códigos enteros en vez de strings
+        df_view = self._to_categorical_view(df, nunique)
+        duplicated_mask = df_view.duplicated()
+        self._cache = {
+            'source': df,
+            'duplicated_mask': duplicated_mask,
+            'duplicated_count': int(duplicated_mask.sum()),
+            'isnull_sum': df_view.isnull().sum(),
+            'nunique': nunique,
+            'dtypes': df.dtypes,
+            'count': df.count(),
+            'n': len(df),
+            'mem_mb': df.memory_usage(deep=True).sum() / 1024**2,
+            'numeric_cols': df.select_dtypes(include=[np.number]).columns
+        }
+    
+    def _to_categorical_view(self, df, nunique):
+        """Copia superficial con las columnas object de baja cardinalidad como category
+
+        Las de alta cardinalidad que solo contienen texto pasan a string[pyarrow]
+        (buffers UTF-8 contiguos) cuando pyarrow está instalado.
+        """
+        n_rows = len(df)
+        if n_rows <= CATEGORICAL_VIEW_MIN_ROWS:
+            return df
+        
+        object_cols = df.columns[(df.dtypes == 'object').to_numpy()]
+        low_cardinality = [col for col in object_cols if nunique[col] < 0.5 * n_rows]
+        high_cardinality = []
+        if PYARROW_AVAILABLE:
+            # Solo columnas de texto puro: con tipos mezclados 1 y "1" pasarían a ser iguales
+            high_cardinality = [
+                col for col in object_cols
+                if nunique[col] >= 0.5 * n_rows and pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+            ]
+        if not low_cardinality and not high_cardinality:
+            return df
+        
+        df_view = df.copy(deep=False)
+        for col in low_cardinality:
+            df_view[col] = df[col].astype('category')
+        for col in high_cardinality:
+            df_view[col] = df[col].astype('string[pyarrow]')
+        return df_view
+    
     def _validate_basic_structure(self, df, file_name):
-        """Validar estructura básica del DataFrame"""
+        """Validar estructura básica del DataFrame; devuelve False si no tiene sentido seguir"""
         try:
             # Verificar que no esté vacío
             if df.empty:
-                self.error_messages.append({
-                    'type': 'estructura',
-                    'severity': 'error',
-                    'message': f"❌ El archivo '{file_name}' está vacío",
-                    'suggestion': "Verifica que el archivo contenga datos válidos"
-                })
-                return
+                self.error_messages.append(Msg(
+                    type='estructura',
+                    severity='error',
+                    message=f"❌ El archivo '{file_name}' está vacío",
+                    suggestion="Verifica que el archivo contenga datos válidos"
+                ))
+                return False
             
             # Verificar dimensiones mínimas
             if len(df) < 2:
-                self.warnings.append({
-                    'type': 'estructura',
-                    'severity': 'warning',
-                    'message': f"⚠️ El archivo '{file_name}' tiene muy pocas filas ({len(df)})",
-                    'suggestion': "Se recomiendan al menos 10 filas para análisis estadísticos"
-                })
+                self.warnings.append(Msg(
+                    type='estructura',
+                    severity='warning',
+                    message=f"⚠️ El archivo '{file_name}' tiene muy pocas filas ({len(df)})",
+                    suggestion="Se recomiendan al menos 10 filas para análisis estadísticos"
+                ))
             
             if len(df.columns) < 1:
-                self.error_messages.append({
-                    'type': 'estructura',
-                    'severity': 'error',
-                    'message': f"❌ El archivo '{file_name}' no tiene columnas",
-                    'suggestion': "Verifica el formato del archivo"
-                })
-                return
+                self.error_messages.append(Msg(
+                    type='estructura',
+                    severity='error',
+                    message=f"❌ El archivo '{file_name}' no tiene columnas",
+                    suggestion="Verifica el formato del archivo"
+                ))
+                return False
+            
+            # Estadísticas por columna calculadas una sola vez y compartidas por los validadores
+            self._build_cache(df)
             
             # Información básica
             self.validation_results['basic_info'] = {
                 'rows': len(df),
                 'columns': len(df.columns),
-                'size_mb': df.memory_usage(deep=True).sum() / 1024**2,
+                'size_mb': self._cache['mem_mb'],
                 'is_large': len(df) > 100000
             }
             
             # Advertencia para archivos grandes
             if len(df) > 100000:
-                self.warnings.append({
-                    'type': 'rendimiento',
-                    'severity': 'warning',
-                    'message': f"⚠️ Archivo grande detectado ({len(df):,} filas)",
-                    'suggestion': "El procesamiento puede ser lento. Considera usar una muestra para pruebas iniciales"
-                })
+                self.warnings.append(Msg(
+                    type='rendimiento',
+                    severity='warning',
+                    message=f"⚠️ Archivo grande detectado ({len(df):,} filas)",
+                    suggestion="El procesamiento puede ser lento. Considera usar una muestra para pruebas iniciales"
+                ))
+            
+            return True
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'estructura',
-                'severity': 'error',
-                'message': f"❌ Error al validar estructura: {str(e)}",
-                'suggestion': "Verifica que el archivo esté en un formato compatible"
-            })
+            self.error_messages.append(Msg(
+                type='estructura',
+                severity='error',
+                message=f"❌ Error al validar estructura: {str(e)}",
+                suggestion="Verifica que el archivo esté en un formato compatible"
+            ))
+            return False
     
     def _validate_data_types(self, df):
         """Validar tipos de datos"""
@@ -109,50 +223,43 @@ class DataValidator:
             type_info = {}
             problematic_columns = []
             
-            for column in df.columns:
-                col_data = df[column]
-                dtype = str(col_data.dtype)
+            # Muestras de cada columna de texto, revisadas antes del recorrido por tipos
+            dtypes = self._cache['dtypes']
+            counts = self._cache['count']
+            probes = {
+                col: self._probe_text_column(df[col], counts[col])
+                for col, col_dtype in dtypes.items() if col_dtype == 'object'
+            }
+            
+            for column, col_dtype in dtypes.items():
+                dtype = str(col_dtype)
                 
-                # Detectar columnas que deberían ser numéricas
-                if dtype == 'object':
-                    # Verificar si contiene números como strings
-                    non_null_values = col_data.dropna()
-                    if len(non_null_values) > 0:
-                        # Intentar convertir a numérico
-                        numeric_convertible = 0
-                        for value in non_null_values.head(100):  # Muestra de 100 valores
-                            try:
-                                float(str(value).replace(',', '.').replace(' ', ''))
-                                numeric_convertible += 1
-                            except:
-                                pass
+                if column in probes:
+                    convertible_ratio, date_like_ratio = probes[column]
+                    
+                    # Detectar columnas que deberían ser numéricas
+                    if convertible_ratio is not None:
+                        self._numeric_convertible[column] = convertible_ratio
                         
-                        if numeric_convertible / len(non_null_values.head(100)) > 0.8:
+                        if convertible_ratio > 0.8:
                             problematic_columns.append({
                                 'column': column,
                                 'issue': 'numeric_as_text',
-                                'convertible_ratio': numeric_convertible / len(non_null_values.head(100))
+                                'convertible_ratio': convertible_ratio
                             })
-                
-                # Detectar fechas como strings
-                if dtype == 'object':
-                    sample_values = col_data.dropna().head(10)
-                    date_like_count = 0
-                    for value in sample_values:
-                        if self._looks_like_date(str(value)):
-                            date_like_count += 1
                     
-                    if date_like_count / len(sample_values) > 0.5 and len(sample_values) > 0:
+                    # Detectar fechas como strings
+                    if date_like_ratio is not None and date_like_ratio > 0.5:
                         problematic_columns.append({
                             'column': column,
                             'issue': 'date_as_text',
-                            'date_like_ratio': date_like_count / len(sample_values)
+                            'date_like_ratio': date_like_ratio
                         })
                 
                 type_info[column] = {
                     'dtype': dtype,
-                    'non_null_count': col_data.count(),
-                    'unique_count': col_data.nunique()
+                    'non_null_count': self._cache['count'][column],
+                    'unique_count': self._cache['nunique'][column]
                 }
             
             self.validation_results['data_types'] = type_info
@@ -160,27 +267,27 @@ class DataValidator:
             # Generar sugerencias para columnas problemáticas
             for prob_col in problematic_columns:
                 if prob_col['issue'] == 'numeric_as_text':
-                    self.suggestions.append({
-                        'type': 'tipo_datos',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{prob_col['column']}' parece contener números como texto",
-                        'suggestion': f"Considera convertir a numérico. {prob_col['convertible_ratio']:.1%} de los valores son convertibles"
-                    })
+                    self.suggestions.append(Msg(
+                        type='tipo_datos',
+                        severity='suggestion',
+                        message=f"💡 La columna '{prob_col['column']}' parece contener números como texto",
+                        suggestion=f"Considera convertir a numérico. {prob_col['convertible_ratio']:.1%} de los valores son convertibles"
+                    ))
                 elif prob_col['issue'] == 'date_as_text':
-                    self.suggestions.append({
-                        'type': 'tipo_datos',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{prob_col['column']}' parece contener fechas como texto",
-                        'suggestion': "Considera convertir a tipo datetime para análisis temporales"
-                    })
+                    self.suggestions.append(Msg(
+                        type='tipo_datos',
+                        severity='suggestion',
+                        message=f"💡 La columna '{prob_col['column']}' parece contener fechas como texto",
+                        suggestion="Considera convertir a tipo datetime para análisis temporales"
+                    ))
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'tipos_datos',
-                'severity': 'error',
-                'message': f"❌ Error al validar tipos de datos: {str(e)}",
-                'suggestion': "Revisa el formato de los datos en el archivo"
-            })
+            self.error_messages.append(Msg(
+                type='tipos_datos',
+                severity='error',
+                message=f"❌ Error al validar tipos de datos: {str(e)}",
+                suggestion="Revisa el formato de los datos en el archivo"
+            ))
     
     def _validate_missing_values(self, df):
         """Validar valores faltantes"""
@@ -188,9 +295,9 @@ class DataValidator:
             missing_info = {}
             critical_missing = []
             
-            for column in df.columns:
-                missing_count = df[column].isnull().sum()
-                missing_pct = (missing_count / len(df)) * 100
+            n_rows = self._cache['n']
+            for column, missing_count in self._cache['isnull_sum'].items():
+                missing_pct = (missing_count / n_rows) * 100
                 
                 missing_info[column] = {
                     'missing_count': missing_count,
@@ -205,46 +312,46 @@ class DataValidator:
                         'missing_pct': missing_pct
                     })
                 elif missing_pct > 20:
-                    self.warnings.append({
-                        'type': 'valores_faltantes',
-                        'severity': 'warning',
-                        'message': f"⚠️ La columna '{column}' tiene {missing_pct:.1f}% de valores faltantes",
-                        'suggestion': "Considera estrategias de imputación o eliminación de esta columna"
-                    })
+                    self.warnings.append(Msg(
+                        type='valores_faltantes',
+                        severity='warning',
+                        message=f"⚠️ La columna '{column}' tiene {missing_pct:.1f}% de valores faltantes",
+                        suggestion="Considera estrategias de imputación o eliminación de esta columna"
+                    ))
             
             self.validation_results['missing_values'] = missing_info
             
             # Errores críticos por demasiados valores faltantes
             for crit in critical_missing:
-                self.error_messages.append({
-                    'type': 'valores_faltantes',
-                    'severity': 'error',
-                    'message': f"❌ La columna '{crit['column']}' tiene {crit['missing_pct']:.1f}% de valores faltantes",
-                    'suggestion': "Esta columna no es útil para análisis. Considera eliminarla"
-                })
+                self.error_messages.append(Msg(
+                    type='valores_faltantes',
+                    severity='error',
+                    message=f"❌ La columna '{crit['column']}' tiene {crit['missing_pct']:.1f}% de valores faltantes",
+                    suggestion="Esta columna no es útil para análisis. Considera eliminarla"
+                ))
             
             # Sugerencia general si hay valores faltantes
-            total_missing = sum([info['missing_count'] for info in missing_info.values()])
+            total_missing = int(self._cache['isnull_sum'].sum())
             if total_missing > 0:
-                self.suggestions.append({
-                    'type': 'valores_faltantes',
-                    'severity': 'suggestion',
-                    'message': f"💡 Se detectaron {total_missing} valores faltantes en total",
-                    'suggestion': "Revisa las estrategias de manejo de valores faltantes antes del análisis"
-                })
+                self.suggestions.append(Msg(
+                    type='valores_faltantes',
+                    severity='suggestion',
+                    message=f"💡 Se detectaron {total_missing} valores faltantes en total",
+                    suggestion="Revisa las estrategias de manejo de valores faltantes antes del análisis"
+                ))
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'valores_faltantes',
-                'severity': 'error',
-                'message': f"❌ Error al validar valores faltantes: {str(e)}",
-                'suggestion': "Verifica la integridad de los datos"
-            })
+            self.error_messages.append(Msg(
+                type='valores_faltantes',
+                severity='error',
+                message=f"❌ Error al validar valores faltantes: {str(e)}",
+                suggestion="Verifica la integridad de los datos"
+            ))
     
     def _validate_duplicates(self, df):
         """Validar filas duplicadas"""
         try:
-            duplicate_count = df.duplicated().sum()
+            duplicate_count = self._cache['duplicated_count']
             duplicate_pct = (duplicate_count / len(df)) * 100
             
             self.validation_results['duplicates'] = {
@@ -255,49 +362,65 @@ class DataValidator:
             
             if duplicate_count > 0:
                 if duplicate_pct > 10:
-                    self.warnings.append({
-                        'type': 'duplicados',
-                        'severity': 'warning',
-                        'message': f"⚠️ Se encontraron {duplicate_count} filas duplicadas ({duplicate_pct:.1f}%)",
-                        'suggestion': "Considera eliminar duplicados antes del análisis"
-                    })
+                    self.warnings.append(Msg(
+                        type='duplicados',
+                        severity='warning',
+                        message=f"⚠️ Se encontraron {duplicate_count} filas duplicadas ({duplicate_pct:.1f}%)",
+                        suggestion="Considera eliminar duplicados antes del análisis"
+                    ))
                 else:
-                    self.suggestions.append({
-                        'type': 'duplicados',
-                        'severity': 'suggestion',
-                        'message': f"💡 Se encontraron {duplicate_count} filas duplicadas ({duplicate_pct:.1f}%)",
-                        'suggestion': "Revisa si los duplicados son intencionales"
-                    })
+                    self.suggestions.append(Msg(
+                        type='duplicados',
+                        severity='suggestion',
+                        message=f"💡 Se encontraron {duplicate_count} filas duplicadas ({duplicate_pct:.1f}%)",
+                        suggestion="Revisa si los duplicados son intencionales"
+                    ))
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'duplicados',
-                'severity': 'error',
-                'message': f"❌ Error al validar duplicados: {str(e)}",
-                'suggestion': "Verifica la estructura de los datos"
-            })
+            self.error_messages.append(Msg(
+                type='duplicados',
+                severity='error',
+                message=f"❌ Error al validar duplicados: {str(e)}",
+                suggestion="Verifica la estructura de los datos"
+            ))
     
     def _validate_outliers(self, df):
         """Detectar valores atípicos en columnas numéricas"""
         try:
-            numeric_columns = df.select_dtypes(include=[np.number]).columns
             outlier_info = {}
             
-            for column in numeric_columns:
-                col_data = df[column].dropna()
-                if len(col_data) < 4:  # Necesitamos al menos 4 valores
-                    continue
+            # Necesitamos al menos 4 valores no nulos por columna
+            valid_counts = self._cache['count'][self._cache['numeric_cols']]
+            valid_counts = valid_counts[valid_counts >= 4]
+            
+            if len(valid_counts) > 0:
+                numeric_data = df[valid_counts.index]
                 
-                # Método IQR
-                Q1 = col_data.quantile(0.25)
-                Q3 = col_data.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
+                # Las columnas constantes no pueden tener outliers: sus límites son el propio valor
+                extremes = numeric_data.agg(['min', 'max'])
+                active = extremes.columns[(extremes.loc['min'] != extremes.loc['max']).to_numpy()]
+                lower_bounds = extremes.loc['min'].astype(float)
+                upper_bounds = extremes.loc['max'].astype(float)
+                outlier_counts = pd.Series(0, index=valid_counts.index)
                 
-                outliers = col_data[(col_data < lower_bound) | (col_data > upper_bound)]
-                outlier_count = len(outliers)
-                outlier_pct = (outlier_count / len(col_data)) * 100
+                if len(active) > 0:
+                    active_data = numeric_data[active]
+                    
+                    # Método IQR para todas las columnas a la vez
+                    quartiles = active_data.quantile([0.25, 0.75])
+                    Q1, Q3 = quartiles.iloc[0], quartiles.iloc[1]
+                    IQR = Q3 - Q1
+                    lower_bounds[active] = Q1 - 1.5 * IQR
+                    upper_bounds[active] = Q3 + 1.5 * IQR
+                    
+                    outlier_mask = active_data.lt(lower_bounds[active]) | active_data.gt(upper_bounds[active])
+                    outlier_counts[active] = outlier_mask.sum()
+            
+            for column, n_valid in valid_counts.items():
+                outlier_count = int(outlier_counts[column])
+                outlier_pct = (outlier_count / n_valid) * 100
+                lower_bound = lower_bounds[column]
+                upper_bound = upper_bounds[column]
                 
                 outlier_info[column] = {
                     'outlier_count': outlier_count,
@@ -308,121 +431,120 @@ class DataValidator:
                 }
                 
                 if outlier_pct > 5:  # Más del 5% son outliers
-                    self.warnings.append({
-                        'type': 'outliers',
-                        'severity': 'warning',
-                        'message': f"⚠️ La columna '{column}' tiene {outlier_count} valores atípicos ({outlier_pct:.1f}%)",
-                        'suggestion': "Revisa estos valores antes del análisis estadístico"
-                    })
+                    self.warnings.append(Msg(
+                        type='outliers',
+                        severity='warning',
+                        message=f"⚠️ La columna '{column}' tiene {outlier_count} valores atípicos ({outlier_pct:.1f}%)",
+                        suggestion="Revisa estos valores antes del análisis estadístico"
+                    ))
                 elif outlier_count > 0:
-                    self.suggestions.append({
-                        'type': 'outliers',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{column}' tiene {outlier_count} valores atípicos",
-                        'suggestion': "Considera si estos valores son errores o datos válidos"
-                    })
+                    self.suggestions.append(Msg(
+                        type='outliers',
+                        severity='suggestion',
+                        message=f"💡 La columna '{column}' tiene {outlier_count} valores atípicos",
+                        suggestion="Considera si estos valores son errores o datos válidos"
+                    ))
             
             self.validation_results['outliers'] = outlier_info
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'outliers',
-                'severity': 'error',
-                'message': f"❌ Error al detectar outliers: {str(e)}",
-                'suggestion': "Verifica que las columnas numéricas tengan datos válidos"
-            })
+            self.error_messages.append(Msg(
+                type='outliers',
+                severity='error',
+                message=f"❌ Error al detectar outliers: {str(e)}",
+                suggestion="Verifica que las columnas numéricas tengan datos válidos"
+            ))
     
     def _validate_data_consistency(self, df):
         """Validar consistencia de datos"""
         try:
             consistency_issues = []
             
+            nunique = self._cache['nunique']
+            counts = self._cache['count']
+            
             # Verificar columnas con pocos valores únicos (posibles categóricas)
-            for column in df.columns:
-                col_data = df[column].dropna()
-                if len(col_data) == 0:
+            for column, col_dtype in self._cache['dtypes'].items():
+                n_valid = counts[column]
+                if n_valid == 0:
                     continue
                 
-                unique_ratio = col_data.nunique() / len(col_data)
+                unique_count = nunique[column]
+                unique_ratio = unique_count / n_valid
                 
                 # Posible variable categórica con muchos valores únicos
-                if col_data.dtype == 'object' and unique_ratio > 0.8 and col_data.nunique() > 50:
+                if col_dtype == 'object' and unique_ratio > 0.8 and unique_count > 50:
                     consistency_issues.append({
                         'column': column,
                         'issue': 'high_cardinality_categorical',
-                        'unique_count': col_data.nunique(),
+                        'unique_count': unique_count,
                         'unique_ratio': unique_ratio
                     })
                 
                 # Posible variable numérica con pocos valores únicos
-                elif col_data.dtype in ['int64', 'float64'] and col_data.nunique() < 10 and len(col_data) > 100:
+                elif col_dtype in ['int64', 'float64'] and unique_count < 10 and n_valid > 100:
                     consistency_issues.append({
                         'column': column,
                         'issue': 'low_cardinality_numeric',
-                        'unique_count': col_data.nunique(),
+                        'unique_count': unique_count,
                         'unique_ratio': unique_ratio
                     })
             
             # Generar sugerencias
             for issue in consistency_issues:
                 if issue['issue'] == 'high_cardinality_categorical':
-                    self.suggestions.append({
-                        'type': 'consistencia',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{issue['column']}' tiene muchos valores únicos ({issue['unique_count']})",
-                        'suggestion': "Podría ser un identificador. Considera si es útil para análisis"
-                    })
+                    self.suggestions.append(Msg(
+                        type='consistencia',
+                        severity='suggestion',
+                        message=f"💡 La columna '{issue['column']}' tiene muchos valores únicos ({issue['unique_count']})",
+                        suggestion="Podría ser un identificador. Considera si es útil para análisis"
+                    ))
                 elif issue['issue'] == 'low_cardinality_numeric':
-                    self.suggestions.append({
-                        'type': 'consistencia',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna numérica '{issue['column']}' tiene pocos valores únicos ({issue['unique_count']})",
-                        'suggestion': "Podría ser una variable categórica codificada numéricamente"
-                    })
+                    self.suggestions.append(Msg(
+                        type='consistencia',
+                        severity='suggestion',
+                        message=f"💡 La columna numérica '{issue['column']}' tiene pocos valores únicos ({issue['unique_count']})",
+                        suggestion="Podría ser una variable categórica codificada numéricamente"
+                    ))
             
             self.validation_results['consistency'] = consistency_issues
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'consistencia',
-                'severity': 'error',
-                'message': f"❌ Error al validar consistencia: {str(e)}",
-                'suggestion': "Revisa la estructura y tipos de datos"
-            })
+            self.error_messages.append(Msg(
+                type='consistencia',
+                severity='error',
+                message=f"❌ Error al validar consistencia: {str(e)}",
+                suggestion="Revisa la estructura y tipos de datos"
+            ))
     
     def _validate_column_names(self, df):
         """Validar nombres de columnas"""
         try:
             column_issues = []
             
-            for column in df.columns:
-                issues = []
-                
+            # Cada regla se evalúa una vez sobre todos los nombres
+            names = df.columns.astype(str)
+            name_lengths = names.str.len()
+            rules = {
                 # Espacios al inicio o final
-                if column != column.strip():
-                    issues.append('trailing_spaces')
-                
+                'trailing_spaces': names != names.str.strip(),
                 # Caracteres especiales problemáticos
-                if re.search(r'[^\w\s\-_]', column):
-                    issues.append('special_characters')
-                
+                'special_characters': names.str.contains(r'[^\w\s\-_]', regex=True),
                 # Nombres muy largos
-                if len(column) > 50:
-                    issues.append('too_long')
-                
+                'too_long': name_lengths > 50,
                 # Nombres muy cortos o poco descriptivos
-                if len(column) < 2:
-                    issues.append('too_short')
-                
+                'too_short': name_lengths < 2,
                 # Nombres que parecen códigos
-                if re.match(r'^[A-Z]{1,3}\d+$', column):
-                    issues.append('code_like')
-                
-                if issues:
-                    column_issues.append({
-                        'column': column,
-                        'issues': issues
-                    })
+                'code_like': names.str.match(r'^[A-Z]{1,3}\d+$')
+            }
+            flags = np.column_stack([np.asarray(mask, dtype=bool) for mask in rules.values()])
+            rule_names = list(rules)
+            
+            for position in np.flatnonzero(flags.any(axis=1)):
+                column_issues.append({
+                    'column': df.columns[position],
+                    'issues': [rule_names[i] for i in np.flatnonzero(flags[position])]
+                })
             
             # Generar sugerencias
             for col_issue in column_issues:
@@ -430,92 +552,106 @@ class DataValidator:
                 issues = col_issue['issues']
                 
                 if 'trailing_spaces' in issues:
-                    self.suggestions.append({
-                        'type': 'nombres_columnas',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{column}' tiene espacios al inicio o final",
-                        'suggestion': "Considera limpiar los nombres de columnas"
-                    })
+                    self.suggestions.append(Msg(
+                        type='nombres_columnas',
+                        severity='suggestion',
+                        message=f"💡 La columna '{column}' tiene espacios al inicio o final",
+                        suggestion="Considera limpiar los nombres de columnas"
+                    ))
                 
                 if 'special_characters' in issues:
-                    self.suggestions.append({
-                        'type': 'nombres_columnas',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{column}' contiene caracteres especiales",
-                        'suggestion': "Usa solo letras, números, guiones y guiones bajos"
-                    })
+                    self.suggestions.append(Msg(
+                        type='nombres_columnas',
+                        severity='suggestion',
+                        message=f"💡 La columna '{column}' contiene caracteres especiales",
+                        suggestion="Usa solo letras, números, guiones y guiones bajos"
+                    ))
                 
                 if 'too_long' in issues:
-                    self.suggestions.append({
-                        'type': 'nombres_columnas',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{column}' tiene un nombre muy largo",
-                        'suggestion': "Considera usar un nombre más corto y descriptivo"
-                    })
+                    self.suggestions.append(Msg(
+                        type='nombres_columnas',
+                        severity='suggestion',
+                        message=f"💡 La columna '{column}' tiene un nombre muy largo",
+                        suggestion="Considera usar un nombre más corto y descriptivo"
+                    ))
                 
                 if 'code_like' in issues:
-                    self.suggestions.append({
-                        'type': 'nombres_columnas',
-                        'severity': 'suggestion',
-                        'message': f"💡 La columna '{column}' parece ser un código",
-                        'suggestion': "Considera usar un nombre más descriptivo"
-                    })
+                    self.suggestions.append(Msg(
+                        type='nombres_columnas',
+                        severity='suggestion',
+                        message=f"💡 La columna '{column}' parece ser un código",
+                        suggestion="Considera usar un nombre más descriptivo"
+                    ))
             
             self.validation_results['column_names'] = column_issues
             
         except Exception as e:
-            self.error_messages.append({
-                'type': 'nombres_columnas',
-                'severity': 'error',
-                'message': f"❌ Error al validar nombres de columnas: {str(e)}",
-                'suggestion': "Verifica que los nombres de columnas sean válidos"
-            })
+            self.error_messages.append(Msg(
+                type='nombres_columnas',
+                severity='error',
+                message=f"❌ Error al validar nombres de columnas: {str(e)}",
+                suggestion="Verifica que los nombres de columnas sean válidos"
+            ))
+    
+    def _probe_text_column(self, col_data, n_valid):
+        """Proporciones de valores numéricos y con forma de fecha en una columna de texto"""
+        if n_valid == 0:
+            return None, None
+        
+        sample = self._non_null_head(col_data, 100)
+        date_like_ratio = sample.head(10).astype(str).str.match(self._DATE_RE).mean()
+        return self._numeric_ratio(sample), date_like_ratio
+    
+    def _non_null_head(self, col_data, size):
+        """Primeros `size` valores no nulos sin copiar la columna completa con dropna()"""
+        window = size
+        while True:
+            head = col_data.iloc[:window]
+            values = head[head.notna()]
+            if len(values) >= size or window >= len(col_data):
+                return values.iloc[:size]
+            window *= 4
+    
+    def _numeric_ratio(self, sample):
+        """Proporción de la muestra (100 valores) convertible a número"""
+        cleaned = (sample.astype(str)
+                   .str.replace(',', '.', regex=False)
+                   .str.replace(' ', '', regex=False))
+        return pd.to_numeric(cleaned, errors='coerce').notna().mean()
     
     def _looks_like_date(self, value):
         """Verificar si un valor parece una fecha"""
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # DD/MM/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # DD-MM-YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-        ]
-        
-        for pattern in date_patterns:
-            if re.match(pattern, str(value)):
-                return True
-        return False
+        return bool(self._DATE_RE.match(str(value)))
     
     def get_validation_summary(self):
         """Obtener resumen de validación"""
-        return {
-            'total_errors': len(self.error_messages),
-            'total_warnings': len(self.warnings),
-            'total_suggestions': len(self.suggestions),
-            'is_ready_for_analysis': len(self.error_messages) == 0,
-            'validation_score': self._calculate_validation_score()
-        }
+        n_errors, n_warnings, n_suggestions = len(self.error_messages), len(self.warnings), len(self.suggestions)
+        return ValidationSummary(
+            total_errors=n_errors,
+            total_warnings=n_warnings,
+            total_suggestions=n_suggestions,
+            is_ready_for_analysis=n_errors == 0,
+            validation_score=self._calculate_validation_score(n_errors, n_warnings, n_suggestions)
+        )
     
-    def _calculate_validation_score(self):
+    def _calculate_validation_score(self, n_errors=None, n_warnings=None, n_suggestions=None):
         """Calcular puntuación de calidad de datos (0-100)"""
-        score = 100
-        
-        # Penalizar errores
-        score -= len(self.error_messages) * 20
-        
-        # Penalizar advertencias
-        score -= len(self.warnings) * 5
-        
-        # Penalizar sugerencias (menos)
-        score -= len(self.suggestions) * 1
+        if n_errors is None:
+            n_errors, n_warnings, n_suggestions = len(self.error_messages), len(self.warnings), len(self.suggestions)
         
-        return max(0, min(100, score))
+        # Penalizar errores (20), advertencias (5) y sugerencias (1)
+        return max(0, min(100, 100 - 20 * n_errors - 5 * n_warnings - n_suggestions))
     
     def suggest_data_cleaning(self, df):
         """Sugerir acciones de limpieza de datos"""
         cleaning_suggestions = []
         
-        # Sugerir eliminación de duplicados
-        if df.duplicated().sum() > 0:
+        # Sugerir eliminación de duplicados (reutiliza la validación si fue sobre este mismo df)
+        if self._cache.get('source') is df:
+            duplicate_count = self._cache['duplicated_count']
+        else:
+            duplicate_count = df.duplicated().sum()
+        if duplicate_count > 0:
             cleaning_suggestions.append({
                 'action': 'remove_duplicates',
                 'description': 'Eliminar filas duplicadas',
@@ -523,7 +659,11 @@ class DataValidator:
             })
         
         # Sugerir manejo de valores faltantes
-        missing_cols = df.columns[df.isnull().any()].tolist()
+        if self._cache.get('source') is df:
+            isnull_sum = self._cache['isnull_sum']
+            missing_cols = isnull_sum[isnull_sum > 0].index.tolist()
+        else:
+            missing_cols = df.columns[df.isnull().any()].tolist()
         if missing_cols:
             cleaning_suggestions.append({
                 'action': 'handle_missing',
@@ -531,19 +671,24 @@ class DataValidator:
                 'code': 'df = df.dropna()  # o usar df.fillna()'
             })
         
-        # Sugerir conversión de tipos
-        for column in df.columns:
-            if df[column].dtype == 'object':
-                # Intentar detectar si debería ser numérico
-                try:
-                    pd.to_numeric(df[column], errors='coerce')
-                    cleaning_suggestions.append({
-                        'action': 'convert_numeric',
-                        'description': f'Convertir {column} a numérico',
-                        'code': f'df["{column}"] = pd.to_numeric(df["{column}"], errors="coerce")'
-                    })
-                except:
-                    pass
+        # Sugerir conversión de tipos (reutiliza las proporciones de _validate_data_types)
+        if self._cache.get('source') is df:
+            numeric_convertible = self._numeric_convertible
+        else:
+            numeric_convertible = {}
+            for column in df.columns[(df.dtypes == 'object').to_numpy()]:
+                col_data = df[column]
+                ratio, _ = self._probe_text_column(col_data, col_data.count())
+                if ratio is not None:
+                    numeric_convertible[column] = ratio
+        
+        for column, ratio in numeric_convertible.items():
+            if ratio > 0.8:
+                cleaning_suggestions.append({
+                    'action': 'convert_numeric',
+                    'description': f'Convertir {column} a numérico',
+                    'code': f'df["{column}"] = pd.to_numeric(df["{column}"], errors="coerce")'
+                })
         
         return cleaning_suggestions
     
@@ -562,7 +707,8 @@ class DataValidator:
             'data_profile': {
                 'shape': df.shape,
                 'dtypes': df.dtypes.astype(str).to_dict(),
-                'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2,
+                'memory_usage_mb': (self._cache['mem_mb'] if self._cache.get('source') is df
+                                    else df.memory_usage(deep=True).sum() / 1024**2),
                 'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
                 'categorical_columns': df.select_dtypes(include=['object', 'category']).columns.tolist()
             }
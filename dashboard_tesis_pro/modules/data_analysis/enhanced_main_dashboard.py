@@ -17,7 +17,143 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import plotly.io as pio
+import requests
+from requests.adapters import HTTPAdapter
+import hashlib
+import json
+import os
+from datetime import datetime
+import io
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
+
+try:
+    import pyarrow.json as paj
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Importar módulos locales
+from data_validation import DataValidator
+from advanced_analysis_tab import (
+    render_advanced_analysis_tab, maybe_downsample, get_column_groups, invalidate_column_groups
+)
+from numeric_kernels import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from numeric_kernels import moments
+
+try:
+    # Sin MathJax: los gráficos no usan LaTeX y Kaleido arranca más rápido
+    pio.kaleido.scope.mathjax = None
+except (AttributeError, ValueError):
+    pass
+
+# Máximo de puntos que se envían al navegador en gráficos punto a punto
+PLOT_POINT_CAP = 20_000
+
+# A partir de cuántos puntos se usa WebGL y un hover reducido
+PLOT_WEBGL_THRESHOLD = 1_000
+
+# Filas por bloque que se envían a AgGrid
+AGGRID_PAGE_SIZE = 100
+
+# Máximo de filas que se ofrecen en las tablas de vista previa con "Todas"
+MAX_TABLE_ROWS = 50_000
+
+# Columnas numéricas a partir de las cuales el reporte Markdown resume las estadísticas
+REPORT_MARKDOWN_MAX_COLS = 20
+
+# Imágenes de la galería de ejemplos de visualización
+EXAMPLE_IMAGE_URLS = (
+    "https://plotly.com/~plotly2_demo/542.png",
+    "https://plotly.com/~plotly2_demo/543.png",
+    "https://plotly.com/~plotly2_demo/544.png"
+)
+
+# Etiquetas de los selectores (definidas una vez en lugar de en cada llamada a format_func)
+ANALYSIS_TYPE_LABELS = {
+    "general": "📊 Análisis General",
+    "numeric": "🔢 Variables Numéricas",
+    "categorical": "📝 Variables Categóricas",
+    "temporal": "📅 Análisis Temporal"
+}
+
+VIZ_CATEGORY_LABELS = {
+    "basic": "📊 Básicos",
+    "statistical": "📈 Estadísticos",
+    "advanced": "🎯 Avanzados",
+    "custom": "🎨 Personalizados"
+}
+
+VIZ_TYPE_LABELS = {
+    "histogram": "📊 Histograma",
+    "scatter": "🔵 Dispersión",
+    "bar": "📊 Barras",
+    "line": "📈 Líneas",
+    "pie": "🥧 Circular",
+    "box": "📦 Caja",
+    "violin": "🎻 Violín",
+    "correlation_heatmap": "🔥 Mapa de Calor",
+    "distribution": "📊 Distribución",
+    "parallel_coordinates": "🔗 Coordenadas Paralelas",
+    "radar": "🎯 Radar",
+    "treemap": "🌳 Mapa de Árbol",
+    "sunburst": "☀️ Sunburst",
+    "3d_scatter": "🌐 Dispersión 3D",
+    "animated": "🎬 Animado",
+    "subplots": "📊 Subgráficos",
+    "dashboard": "📋 Dashboard"
+}
+
+EXPORT_FORMAT_LABELS = {
+    "excel": "📊 Excel (.xlsx)",
+    "csv": "📄 CSV (.csv)",
+    "json": "📋 JSON (.json)",
+    "parquet": "🗃️ Parquet (.parquet)"
+}
+
+REPORT_SECTION_LABELS = {
+    "resumen_ejecutivo": "📋 Resumen Ejecutivo",
+    "validacion_datos": "🔍 Validación de Datos",
+    "estadisticas_descriptivas": "📊 Estadísticas Descriptivas",
+    "visualizaciones": "📈 Visualizaciones",
+    "analisis_avanzados": "🔬 Análisis Avanzados",
+    "conclusiones": "💡 Conclusiones"
+}
+
+REPORT_FORMAT_LABELS = {
+    "html": "🌐 HTML",
+    "markdown": "📝 Markdown",
+    "pdf": "📄 PDF"
+}
+
+# Estilos del reporte HTML
+REPORT_HTML_STYLE = """
+                <style>
+                    body { font-family: Arial, sans-serif; margin: 40px; }
+                    h1, h2 { color: #2196F3; }
+                    table { border-collapse: collapse; width: 100%; }
+                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                    th { background-color: #f2f2f2; }
+                    .metric { background: #f8f9fa; padding: 10px; margin: 10px 0; border-left: 4px solid #2196F3; }
+                </style>
+"""
 
 def create_advanced_visualization(df, viz_type, columns, color_palette, plot_theme):
     """Crear visualizaciones avanzadas"""
@@ -25,22 +161,32 @@ def create_advanced_visualization(df, viz_type, columns, color_palette, plot_the
         fig = None
         
         if viz_type == "histogram" and len(columns) >= 1:
+            # Sin submuestreo: las frecuencias del histograma deben ser las reales
             fig = px.histogram(df, x=columns[0], title=f"Histograma de {columns[0]}")
             
         elif viz_type == "scatter" and len(columns) >= 2:
             color_col = columns[2] if len(columns) > 2 else None
-            fig = px.scatter(df, x=columns[0], y=columns[1], color=color_col,
+            plot_df = maybe_downsample(df, color_col, PLOT_POINT_CAP)
+            large = len(plot_df) > PLOT_WEBGL_THRESHOLD
+            fig = px.scatter(plot_df, x=columns[0], y=columns[1], color=color_col,
+                           render_mode="webgl" if large else "svg",
                            title=f"Gráfico de Dispersión: {columns[0]} vs {columns[1]}")
+            if large:
+                fig.update_traces(hovertemplate="%{x}, %{y}<extra></extra>")
             
         elif viz_type == "3d_scatter" and len(columns) >= 3:
             color_col = columns[3] if len(columns) > 3 else None
-            fig = px.scatter_3d(df, x=columns[0], y=columns[1], z=columns[2], color=color_col,
+            plot_df = maybe_downsample(df, color_col, PLOT_POINT_CAP)
+            fig = px.scatter_3d(plot_df, x=columns[0], y=columns[1], z=columns[2], color=color_col,
                               title=f"Dispersión 3D: {columns[0]}, {columns[1]}, {columns[2]}")
+            if len(plot_df) > PLOT_WEBGL_THRESHOLD:
+                # Marcadores pequeños y hover solo con coordenadas para muchos puntos
+                fig.update_traces(marker=dict(size=3), hovertemplate="%{x}, %{y}, %{z}<extra></extra>")
             
         elif viz_type == "parallel_coordinates":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_cols, _, _ = get_column_groups(df)
             if len(numeric_cols) >= 3:
-                fig = px.parallel_coordinates(df, dimensions=numeric_cols[:5],
+                fig = px.parallel_coordinates(maybe_downsample(df, cap=PLOT_POINT_CAP), dimensions=numeric_cols[:5],
                                             title="Coordenadas Paralelas")
         
         # Aplicar configuraciones de estilo
@@ -61,17 +207,6 @@ def create_advanced_visualization(df, viz_type, columns, color_palette, plot_the
     except Exception as e:
         st.error(f"❌ Error al crear visualización: {str(e)}")
         return None
-import requests
-import json
-import os
-from datetime import datetime
-import io
-import base64
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
-
-# Importar módulos locales
-from data_validation import DataValidator
-from advanced_analysis_tab import render_advanced_analysis_tab
 
 # Configuración de la página
 st.set_page_config(
@@ -173,6 +308,239 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def _http_session():
+    """Sesión HTTP compartida: reutiliza las conexiones keep-alive con la API de archivos"""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_available_files(file_api_url):
+    """Listado de archivos analizables, cacheado unos segundos para no consultar la API en cada rerun"""
+    try:
+        response = _http_session().get(f"{file_api_url}/files/analyzable", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return {"files": [], "count": 0}
+    except requests.exceptions.RequestException:
+        return {"files": [], "count": 0}
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_explorer_status(file_api_url):
+    """Estado y estadísticas del explorador, pedidos en paralelo y cacheados unos segundos"""
+    session = _http_session()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        status_future = executor.submit(session.get, f"{file_api_url}/status", timeout=3)
+        stats_future = executor.submit(session.get, f"{file_api_url}/stats", timeout=3)
+        try:
+            status_response = status_future.result()
+        except requests.exceptions.RequestException:
+            return {"reachable": False, "status_ok": False, "stats": None}
+        try:
+            stats_response = stats_future.result()
+            stats = stats_response.json() if stats_response.status_code == 200 else None
+        except (requests.exceptions.RequestException, ValueError):
+            stats = None
+    
+    return {"reachable": True, "status_ok": status_response.status_code == 200, "stats": stats}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_example_image(url):
+    """Bytes de una imagen de la galería (None si no se pudo descargar)"""
+    try:
+        response = _http_session().get(url, timeout=3)
+        return response.content if response.status_code == 200 else None
+    except requests.exceptions.RequestException:
+        return None
+
+def _read_csv(full_path):
+    """Leer CSV con el lector multihilo de pyarrow si está disponible"""
+    if PYARROW_AVAILABLE:
+        df = pd.read_csv(full_path, engine='pyarrow')
+        # pyarrow deja vacío el nombre de una columna sin encabezado; se usa el
+        # 'Unnamed: N' del lector por defecto para que la validación lo detecte igual
+        df.columns = [f'Unnamed: {i}' if name == '' else name for i, name in enumerate(df.columns)]
+        return df
+    return pd.read_csv(full_path)
+
+def _read_excel(full_path):
+    """Leer Excel con calamine (lector nativo) si está disponible, si no con openpyxl/xlrd"""
+    if CALAMINE_AVAILABLE:
+        return pd.read_excel(full_path, engine='calamine')
+    return pd.read_excel(full_path)
+
+def _read_json(full_path):
+    """Leer JSON tabular: arreglos u objetos con json, registros por línea con pyarrow"""
+    try:
+        with open(full_path, 'r') as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        # Más de un documento en el archivo: registros JSON uno por línea
+        if PYARROW_AVAILABLE:
+            # pyarrow los analiza en C y en bloques paralelos; solo se usa aquí porque
+            # también aceptaría un objeto único y lo devolvería con otra forma
+            table = paj.read_json(full_path, read_options=paj.ReadOptions(block_size=8 << 20))
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        return pd.read_json(full_path, lines=True)
+    if isinstance(data, list):
+        return pd.DataFrame(data)
+    elif isinstance(data, dict):
+        if 'records' in data:
+            return pd.DataFrame(data['records'])
+        else:
+            return pd.json_normalize(data)
+    else:
+        raise ValueError("Formato JSON no soportado")
+
+def _read_parquet(full_path):
+    """Leer Parquet liberando los buffers de Arrow durante la conversión"""
+    if PYARROW_AVAILABLE:
+        # Convertir liberando cada buffer de Arrow apenas pasa a pandas: el pico de memoria
+        # queda cerca del tamaño del DataFrame final en lugar del doble
+        table = pq.read_table(full_path, use_threads=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    return pd.read_parquet(full_path)
+
+# Lector por extensión de archivo
+READERS = {
+    "csv": _read_csv,
+    "xlsx": _read_excel,
+    "xls": _read_excel,
+    "json": _read_json,
+    "parquet": _read_parquet
+}
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _read_data_file(full_path, extension, mtime):
+    """Leer un archivo a DataFrame; `mtime` invalida la caché cuando el archivo cambia"""
+    reader = READERS.get(extension)
+    if reader is None:
+        raise ValueError(f"Formato de archivo no soportado: {extension}")
+    return reader(full_path)
+
+def get_df_key(df, file_name):
+    """Clave del DataFrame cargado para las funciones cacheadas: huella de contenido o identidad"""
+    df_hash = st.session_state.get('df_hash')
+    return (file_name, df_hash if df_hash is not None else id(df))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _describe_numeric(df_key, cols, _df):
+    """describe() de las columnas elegidas, cacheado por DataFrame y selección"""
+    return _df[list(cols)].describe()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _corr(df_key, cols, _df):
+    """Matriz de correlación de las columnas elegidas, cacheada por DataFrame y selección"""
+    sub = _df[list(cols)]
+    arr = sub.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(arr).any():
+        # Con faltantes se necesita la correlación por pares de pandas
+        return sub.corr()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(arr, rowvar=False)
+    return pd.DataFrame(corr, index=sub.columns, columns=sub.columns)
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=50)
+def _cached_visualization_json(df_hash, viz_type, columns, color_palette, plot_theme, _df):
+    """JSON de la visualización, persistido en disco por contenido del DataFrame y configuración"""
+    fig = create_advanced_visualization(_df, viz_type, list(columns), color_palette, plot_theme)
+    return pio.to_json(fig, validate=False) if fig else None
+
+def build_visualization(df, viz_type, columns, color_palette, plot_theme):
+    """Visualización desde la caché en disco cuando el DataFrame tiene huella de contenido"""
+    df_hash = st.session_state.get('df_hash')
+    if df_hash is None:
+        # Sin huella estable no se puede reutilizar entre sesiones ni reinicios
+        return create_advanced_visualization(df, viz_type, columns, color_palette, plot_theme)
+    fig_json = _cached_visualization_json(df_hash, viz_type, tuple(columns), color_palette, plot_theme, df)
+    return pio.from_json(fig_json) if fig_json else None
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _figure_image(fig_json, image_format):
+    """Imagen estática de una figura, cacheada por su JSON y formato"""
+    return pio.from_json(fig_json).to_image(format=image_format, width=1200, height=800)
+
+def _frame_fingerprint(df):
+    """Huella del contenido del DataFrame en una pasada vectorizada (None si hay celdas no hasheables)"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        return None
+    # Digerir los hashes por fila en orden: una suma no distingue filas reordenadas
+    # y la huella indexa cachés posicionales como `_group_indices`
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    # Los hashes por fila ignoran los nombres de columna: el mismo contenido con otros
+    # encabezados no debe reutilizar el reporte de validación ni las cachés por columna
+    digest.update(repr(tuple(df.columns)).encode('utf-8'))
+    digest.update(repr(tuple(str(dtype) for dtype in df.dtypes)).encode('utf-8'))
+    return digest.hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_validation_report(fingerprint, file_name, _df):
+    """Reporte de validación cacheado por contenido y nombre del archivo"""
+    return DataValidator().create_validation_report(_df, file_name)
+
+def validate_data(df, file_name, fingerprint):
+    """Reporte de validación; recargar el mismo contenido no vuelve a recorrer el DataFrame"""
+    if fingerprint is None:
+        return DataValidator().create_validation_report(df, file_name)
+    return _cached_validation_report(fingerprint, file_name, df)
+
+def optimize_dtypes(df):
+    """Reducir tipos tras la carga: enteros al menor ancho, texto repetitivo a category,
+    columnas de texto con fechas a datetime y el resto del texto a string[pyarrow]"""
+    df = df.copy(deep=False)
+    n_rows = len(df)
+    
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    for col in df.select_dtypes(include=['object']).columns:
+        col_data = df[col]
+        sample = col_data.dropna().head(100)
+        if len(sample) == 0:
+            continue
+        
+        if sample.astype(str).str.match(DataValidator._DATE_RE).mean() > 0.9:
+            parsed = pd.to_datetime(col_data, errors='coerce', cache=True)
+            # Solo si ningún valor se pierde en la conversión
+            if parsed.isna().sum() == col_data.isna().sum():
+                df[col] = parsed
+                continue
+        
+        try:
+            if col_data.nunique() < 0.5 * n_rows:
+                df[col] = col_data.astype('category')
+            elif PYARROW_AVAILABLE and pd.api.types.infer_dtype(col_data, skipna=True) == 'string':
+                # Texto en un buffer UTF-8 contiguo en lugar de un objeto Python por celda
+                df[col] = col_data.astype('string[pyarrow]')
+        except TypeError:
+            # Celdas no hasheables (listas o dicts de un JSON anidado): se deja como object
+            continue
+    
+    return df
+
+def store_loaded_data(data, file_name, validation_report, fingerprint):
+    """Guardar en sesión el DataFrame cargado junto con sus métricas generales,
+    que no dependen de ningún widget y así no se recalculan en cada rerun"""
+    df = optimize_dtypes(data)
+    st.session_state['data'] = df
+    # Huella del contenido: clave de las funciones cacheadas mientras este archivo esté cargado
+    st.session_state['df_hash'] = fingerprint
+    st.session_state['file_name'] = file_name
+    st.session_state['validation_report'] = validation_report
+    
+    n_rows, n_cols = df.shape
+    n_cells = n_rows * n_cols
+    st.session_state['n_rows'] = n_rows
+    st.session_state['n_cols'] = n_cols
+    st.session_state['mem_mb'] = df.memory_usage(deep=True).sum() / 1024**2
+    st.session_state['missing_pct'] = df.isnull().sum().sum() / n_cells * 100 if n_cells else 0.0
+    st.session_state['n_numeric'] = len(get_column_groups(df)[0])
+    return df
+
 class EnhancedDataAnalysisModule:
     def __init__(self):
         self.file_api_url = "http://localhost:8060/api"
@@ -182,20 +550,13 @@ class EnhancedDataAnalysisModule:
         
     def get_available_files(self):
         """Obtener archivos disponibles desde el explorador"""
-        try:
-            response = requests.get(f"{self.file_api_url}/files/analyzable", timeout=5)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"files": [], "count": 0}
-        except requests.exceptions.RequestException:
-            return {"files": [], "count": 0}
+        return _cached_available_files(self.file_api_url)
     
     def load_file(self, file_path):
         """Cargar archivo para análisis con validación"""
         try:
             # Obtener información del archivo
-            file_info_response = requests.get(
+            file_info_response = _http_session().get(
                 f"{self.file_api_url}/files/info", 
                 params={"path": file_path},
                 timeout=10
@@ -209,28 +570,11 @@ class EnhancedDataAnalysisModule:
             full_path = file_info["full_path"]
             extension = file_info["extension"]
             
-            # Cargar datos según el tipo de archivo
-            if extension == "csv":
-                df = pd.read_csv(full_path)
-            elif extension in ["xlsx", "xls"]:
-                df = pd.read_excel(full_path)
-            elif extension == "json":
-                with open(full_path, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        df = pd.DataFrame(data)
-                    elif isinstance(data, dict):
-                        if 'records' in data:
-                            df = pd.DataFrame(data['records'])
-                        else:
-                            df = pd.json_normalize(data)
-                    else:
-                        st.error("❌ Formato JSON no soportado")
-                        return None
-            elif extension == "parquet":
-                df = pd.read_parquet(full_path)
-            else:
-                st.error(f"❌ Formato de archivo no soportado: {extension}")
+            # Cargar datos según el tipo de archivo (cacheado por ruta y fecha de modificación)
+            try:
+                df = _read_data_file(full_path, extension, os.path.getmtime(full_path))
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
                 return None
             
             return df
@@ -243,17 +587,27 @@ class EnhancedDataAnalysisModule:
         """Crear tabla interactiva con AgGrid"""
         try:
             # Limitar filas para rendimiento
-            display_df = df.head(max_rows) if len(df) > max_rows else df
+            n_rows = min(len(df), max_rows)
+            
+            # Solo se serializa al navegador el bloque de filas visible
+            n_pages = max(1, -(-n_rows // AGGRID_PAGE_SIZE))
+            page = 1
+            if n_pages > 1:
+                page = st.number_input(
+                    f"Página (de {n_pages}):", min_value=1, max_value=n_pages, value=1, step=1,
+                    key="aggrid_page"
+                )
+            start = (page - 1) * AGGRID_PAGE_SIZE
+            display_df = df.iloc[start:min(start + AGGRID_PAGE_SIZE, n_rows)]
             
             # Configurar AgGrid
             gb = GridOptionsBuilder.from_dataframe(display_df)
-            gb.configure_pagination(paginationAutoPageSize=True)
             gb.configure_side_bar()
             gb.configure_selection('multiple', use_checkbox=True, groupSelectsChildren="Group checkbox select children")
             gb.configure_default_column(enablePivot=True, enableValue=True, enableRowGroup=True)
             
             # Configurar columnas numéricas
-            numeric_cols = display_df.select_dtypes(include=[np.number]).columns
+            numeric_cols, _, _ = get_column_groups(df)
             for col in numeric_cols:
                 gb.configure_column(col, type=["numericColumn", "numberColumnFilter", "customNumericFormat"], precision=2)
             
@@ -321,14 +675,15 @@ if available_files["count"] > 0:
             with st.spinner("Cargando y validando archivo..."):
                 data = analysis_module.load_file(selected_file_path)
                 if data is not None:
-                    # Validar datos
-                    validation_report = analysis_module.validator.create_validation_report(
-                        data, available_files["files"][selected_file_index]["name"]
+                    # Validar datos (antes de optimizar tipos, para detectar números/fechas como texto)
+                    fingerprint = _frame_fingerprint(data)
+                    validation_report = validate_data(
+                        data, available_files["files"][selected_file_index]["name"], fingerprint
                     )
                     
-                    st.session_state['data'] = data
-                    st.session_state['file_name'] = available_files["files"][selected_file_index]["name"]
-                    st.session_state['validation_report'] = validation_report
+                    store_loaded_data(
+                        data, available_files["files"][selected_file_index]["name"], validation_report, fingerprint
+                    )
                     
                     # Mostrar resultado de validación en sidebar
                     if validation_report['summary']['is_ready_for_analysis']:
@@ -350,20 +705,25 @@ uploaded_file = st.sidebar.file_uploader(
 
 if uploaded_file is not None:
     try:
-        if uploaded_file.name.endswith('.csv'):
-            data = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            data = pd.read_excel(uploaded_file)
-        elif uploaded_file.name.endswith('.json'):
-            data = pd.read_json(uploaded_file)
-        
-        # Validar datos
-        validation_report = analysis_module.validator.create_validation_report(data, uploaded_file.name)
-        
-        st.session_state['data'] = data
-        st.session_state['file_name'] = uploaded_file.name
-        st.session_state['validation_report'] = validation_report
+        # El uploader devuelve el mismo archivo en cada rerun: solo se lee, valida y
+        # guarda cuando cambia, si no cada interacción repetiría toda la carga
+        upload_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+        if st.session_state.get('uploaded_file_id') != upload_id:
+            if uploaded_file.name.endswith('.csv'):
+                data = pd.read_csv(uploaded_file)
+            elif uploaded_file.name.endswith(('.xlsx', '.xls')):
+                data = pd.read_excel(uploaded_file)
+            elif uploaded_file.name.endswith('.json'):
+                data = pd.read_json(uploaded_file)
+            
+            # Validar datos
+            fingerprint = _frame_fingerprint(data)
+            validation_report = validate_data(data, uploaded_file.name, fingerprint)
+            
+            store_loaded_data(data, uploaded_file.name, validation_report, fingerprint)
+            st.session_state['uploaded_file_id'] = upload_id
         
+        validation_report = st.session_state['validation_report']
         if validation_report['summary']['is_ready_for_analysis']:
             st.sidebar.success(f"✅ Archivo cargado y validado: {uploaded_file.name}")
         else:
@@ -397,628 +757,681 @@ if 'validation_report' in st.session_state:
     if summary['total_suggestions'] > 0:
         st.sidebar.info(f"💡 {summary['total_suggestions']} sugerencias")
 
-# Contenido principal
-if 'data' in st.session_state and st.session_state['data'] is not None:
-    df = st.session_state['data']
-    file_name = st.session_state.get('file_name', 'archivo_cargado')
-    validation_report = st.session_state.get('validation_report', {})
+# Cada tab se ejecuta como fragmento: sus widgets solo vuelven a ejecutar ese tab
+@st.fragment
+def render_general_tab(df, file_name):
+    """Renderizar vista general del DataFrame"""
     
-    # Tabs principales mejorados
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📋 Vista General", 
-        "🔍 Validación de Datos",
-        "📊 Estadísticas Descriptivas", 
-        "📈 Visualizaciones", 
-        "🔬 Análisis Avanzados",
-        "📤 Exportar Resultados"
-    ])
+    st.subheader(f"📋 Vista General - {file_name}")
     
-    with tab1:
-        st.subheader(f"📋 Vista General - {file_name}")
-        
-        # Métricas principales
-        col1, col2, col3, col4, col5 = st.columns(5)
+    # Métricas principales
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    # Métricas calculadas una sola vez al cargar el archivo (store_loaded_data)
+    with col1:
+        st.metric("📊 Filas", f"{st.session_state['n_rows']:,}")
+    with col2:
+        st.metric("📋 Columnas", st.session_state['n_cols'])
+    with col3:
+        st.metric("💾 Memoria", f"{st.session_state['mem_mb']:.1f} MB")
+    with col4:
+        st.metric("❓ Datos Faltantes", f"{st.session_state['missing_pct']:.1f}%")
+    with col5:
+        st.metric("🔢 Cols. Numéricas", st.session_state['n_numeric'])
+    
+    # Vista previa con tabla interactiva
+    st.markdown("### 🔍 Vista Previa Interactiva")
+    
+    # Opciones de visualización
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        show_rows = st.selectbox("Filas a mostrar:", [100, 500, 1000, "Todas"], index=0)
+    with col2:
+        table_type = st.selectbox("Tipo de tabla:", ["Interactiva (AgGrid)", "Estándar"], index=0)
+    with col3:
+        if st.button("🔄 Actualizar Vista"):
+            st.rerun()
+    
+    # Mostrar tabla según configuración
+    display_rows = len(df) if show_rows == "Todas" else show_rows
+    if display_rows > MAX_TABLE_ROWS:
+        st.warning(f"⚠️ Mostrando las primeras {MAX_TABLE_ROWS:,} filas de {len(df):,}; exporta los datos para verlos completos")
+        display_rows = MAX_TABLE_ROWS
+    
+    if table_type == "Interactiva (AgGrid)":
+        analysis_module.create_interactive_table(df, display_rows)
+    else:
+        st.dataframe(df.head(display_rows), use_container_width=True)
+    
+    # Información de columnas mejorada
+    st.markdown("### 📋 Información Detallada de Columnas")
+    
+    # Reducciones sobre todo el DataFrame en lugar de un recorrido por columna
+    null_counts = df.isnull().sum().to_numpy()
+    info_df = pd.DataFrame({
+        'Columna': df.columns,
+        'Tipo': df.dtypes.astype(str).to_numpy(),
+        'No Nulos': df.count().to_numpy(),
+        'Nulos': null_counts,
+        '% Nulos': (null_counts * 100.0 / len(df)).round(2),
+        'Únicos': df.nunique().to_numpy(),
+        'Memoria (KB)': (df.memory_usage(deep=True, index=False).to_numpy() / 1024).round(2)
+    })
+    st.dataframe(info_df, use_container_width=True)
+
+@st.fragment
+def render_validation_tab(validation_report):
+    """Renderizar reporte de validación y calidad de datos"""
+    
+    st.subheader("🔍 Validación y Calidad de Datos")
+    
+    if validation_report:
+        # Resumen de validación
+        summary = validation_report['summary']
         
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("📊 Filas", f"{len(df):,}")
+            st.metric("📊 Puntuación de Calidad", f"{summary['validation_score']}/100")
         with col2:
-            st.metric("📋 Columnas", len(df.columns))
+            st.metric("❌ Errores", summary['total_errors'])
         with col3:
-            st.metric("💾 Memoria", f"{df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+            st.metric("⚠️ Advertencias", summary['total_warnings'])
         with col4:
-            missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100)
-            st.metric("❓ Datos Faltantes", f"{missing_pct:.1f}%")
-        with col5:
-            numeric_cols = len(df.select_dtypes(include=[np.number]).columns)
-            st.metric("🔢 Cols. Numéricas", numeric_cols)
+            st.metric("💡 Sugerencias", summary['total_suggestions'])
         
-        # Vista previa con tabla interactiva
-        st.markdown("### 🔍 Vista Previa Interactiva")
+        # Estado general
+        if summary['is_ready_for_analysis']:
+            st.success("✅ Los datos están listos para análisis")
+        else:
+            st.warning("⚠️ Se recomienda revisar los problemas detectados antes del análisis")
         
-        # Opciones de visualización
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            show_rows = st.selectbox("Filas a mostrar:", [100, 500, 1000, "Todas"], index=0)
-        with col2:
-            table_type = st.selectbox("Tipo de tabla:", ["Interactiva (AgGrid)", "Estándar"], index=0)
-        with col3:
-            if st.button("🔄 Actualizar Vista"):
-                st.rerun()
+        # Mostrar problemas detallados
+        validation_result = validation_report['validation_result']
         
-        # Mostrar tabla según configuración
-        if table_type == "Interactiva (AgGrid)":
-            max_rows = len(df) if show_rows == "Todas" else show_rows
-            grid_response = analysis_module.create_interactive_table(df, max_rows)
-        else:
-            display_rows = len(df) if show_rows == "Todas" else show_rows
-            st.dataframe(df.head(display_rows), use_container_width=True)
+        if validation_result['errors']:
+            st.markdown("### ❌ Errores Detectados")
+            for error in validation_result['errors']:
+                st.error(f"**{error['message']}**\n\n💡 {error['suggestion']}")
         
-        # Información de columnas mejorada
-        st.markdown("### 📋 Información Detallada de Columnas")
+        if validation_result['warnings']:
+            st.markdown("### ⚠️ Advertencias")
+            for warning in validation_result['warnings']:
+                st.warning(f"**{warning['message']}**\n\n💡 {warning['suggestion']}")
         
-        info_data = []
-        for col in df.columns:
-            col_data = df[col]
-            info_data.append({
-                'Columna': col,
-                'Tipo': str(col_data.dtype),
-                'No Nulos': col_data.count(),
-                'Nulos': col_data.isnull().sum(),
-                '% Nulos': round((col_data.isnull().sum() / len(df)) * 100, 2),
-                'Únicos': col_data.nunique(),
-                'Memoria (KB)': round(col_data.memory_usage(deep=True) / 1024, 2)
-            })
+        if validation_result['suggestions']:
+            st.markdown("### 💡 Sugerencias de Mejora")
+            for suggestion in validation_result['suggestions']:
+                st.info(f"**{suggestion['message']}**\n\n💡 {suggestion['suggestion']}")
         
-        info_df = pd.DataFrame(info_data)
-        st.dataframe(info_df, use_container_width=True)
+        # Sugerencias de limpieza
+        cleaning_suggestions = validation_report.get('cleaning_suggestions', [])
+        if cleaning_suggestions:
+            st.markdown("### 🧹 Sugerencias de Limpieza")
+            
+            for idx, suggestion in enumerate(cleaning_suggestions):
+                with st.expander(f"🔧 {suggestion['description']}"):
+                    st.code(suggestion['code'], language='python')
+                    if st.button(f"Aplicar: {suggestion['action']}", key=f"btn_clean_{idx}_{suggestion['action']}"):
+                        st.info("🚧 Funcionalidad de limpieza automática en desarrollo")
+    else:
+        st.info("📊 Carga un archivo para ver el reporte de validación")
+
+@st.fragment
+def render_statistics_tab(df, df_key):
+    """Renderizar estadísticas descriptivas"""
     
-    with tab2:
-        st.subheader("🔍 Validación y Calidad de Datos")
+    st.subheader("📊 Estadísticas Descriptivas Avanzadas")
+    
+    # Selector de tipo de análisis descriptivo
+    analysis_type = st.selectbox(
+        "Tipo de análisis:",
+        ["general", "numeric", "categorical", "temporal"],
+        format_func=ANALYSIS_TYPE_LABELS.get
+    )
+    
+    if analysis_type == "general":
+        # Estadísticas generales
+        col1, col2 = st.columns(2)
         
-        if validation_report:
-            # Resumen de validación
-            summary = validation_report['summary']
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("📊 Puntuación de Calidad", f"{summary['validation_score']}/100")
-            with col2:
-                st.metric("❌ Errores", summary['total_errors'])
-            with col3:
-                st.metric("⚠️ Advertencias", summary['total_warnings'])
-            with col4:
-                st.metric("💡 Sugerencias", summary['total_suggestions'])
-            
-            # Estado general
-            if summary['is_ready_for_analysis']:
-                st.success("✅ Los datos están listos para análisis")
+        with col1:
+            st.markdown("#### 🔢 Variables Numéricas")
+            numeric_cols, _, _ = get_column_groups(df)
+            if len(numeric_cols) > 0:
+                numeric_stats = _describe_numeric(df_key, tuple(numeric_cols), df)
+                st.dataframe(numeric_stats.round(4), use_container_width=True)
             else:
-                st.warning("⚠️ Se recomienda revisar los problemas detectados antes del análisis")
-            
-            # Mostrar problemas detallados
-            validation_result = validation_report['validation_result']
-            
-            if validation_result['errors']:
-                st.markdown("### ❌ Errores Detectados")
-                for error in validation_result['errors']:
-                    st.error(f"**{error['message']}**\n\n💡 {error['suggestion']}")
-            
-            if validation_result['warnings']:
-                st.markdown("### ⚠️ Advertencias")
-                for warning in validation_result['warnings']:
-                    st.warning(f"**{warning['message']}**\n\n💡 {warning['suggestion']}")
-            
-            if validation_result['suggestions']:
-                st.markdown("### 💡 Sugerencias de Mejora")
-                for suggestion in validation_result['suggestions']:
-                    st.info(f"**{suggestion['message']}**\n\n💡 {suggestion['suggestion']}")
+                st.info("No hay variables numéricas")
+        
+        with col2:
+            st.markdown("#### 📝 Variables Categóricas")
+            _, categorical_cols, _ = get_column_groups(df)
+            if len(categorical_cols) > 0:
+                cat_info = []
+                for col in categorical_cols:
+                    # Un solo conteo por columna da únicos, moda y su frecuencia
+                    value_counts = df[col].value_counts(sort=True)
+                    value_counts = value_counts[value_counts > 0]
+                    cat_info.append({
+                        'Columna': col,
+                        'Únicos': len(value_counts),
+                        'Más Frecuente': value_counts.index[0] if len(value_counts) > 0 else 'N/A',
+                        'Frecuencia': int(value_counts.iloc[0]) if len(value_counts) > 0 else 0
+                    })
+                cat_df = pd.DataFrame(cat_info)
+                st.dataframe(cat_df, use_container_width=True)
+            else:
+                st.info("No hay variables categóricas")
+    
+    elif analysis_type == "numeric":
+        numeric_cols, _, _ = get_column_groups(df)
+        if not numeric_cols:
+            st.warning("⚠️ No hay columnas numéricas disponibles")
+        else:
+            selected_numeric = st.multiselect(
+                "Seleccionar variables numéricas:",
+                numeric_cols,
+                default=numeric_cols[:5]  # Máximo 5 por defecto
+            )
             
-            # Sugerencias de limpieza
-            cleaning_suggestions = validation_report.get('cleaning_suggestions', [])
-            if cleaning_suggestions:
-                st.markdown("### 🧹 Sugerencias de Limpieza")
+            if selected_numeric:
+                # Estadísticas detalladas
+                stats_df = _describe_numeric(df_key, tuple(selected_numeric), df)
+                
+                # Agregar estadísticas adicionales (una reducción por estadístico para todas las columnas)
+                selected_data = df[selected_numeric]
+                if NUMBA_AVAILABLE:
+                    # Un kernel nativo por columna calcula todos los momentos a la vez
+                    column_moments = np.array([
+                        moments(np.ascontiguousarray(selected_data[col].to_numpy(dtype=np.float64, na_value=np.nan)))
+                        for col in selected_numeric
+                    ], dtype=np.float64).reshape(-1, 5)
+                    means = pd.Series(column_moments[:, 1], index=selected_numeric)
+                    stds = pd.Series(column_moments[:, 2], index=selected_numeric)
+                    skewness = pd.Series(column_moments[:, 3], index=selected_numeric)
+                    kurtosis = pd.Series(column_moments[:, 4], index=selected_numeric)
+                else:
+                    means = selected_data.mean()
+                    stds = selected_data.std()
+                    skewness = selected_data.skew()
+                    kurtosis = selected_data.kurt()
+                additional_stats = pd.DataFrame({
+                    'skewness': skewness,
+                    'kurtosis': kurtosis,
+                    'cv': stds.div(means).where(means != 0)
+                })
                 
-                for idx, suggestion in enumerate(cleaning_suggestions):
-                    with st.expander(f"🔧 {suggestion['description']}"):
-                        st.code(suggestion['code'], language='python')
-                        if st.button(f"Aplicar: {suggestion['action']}", key=f"btn_clean_{idx}_{suggestion['action']}"):
-                            st.info("🚧 Funcionalidad de limpieza automática en desarrollo")
+                combined_stats = pd.concat([stats_df, additional_stats.T])
+                st.dataframe(combined_stats.round(4), use_container_width=True)
+                
+                # Matriz de correlación
+                if len(selected_numeric) > 1:
+                    st.markdown("#### 🔗 Matriz de Correlación")
+                    corr_matrix = _corr(df_key, tuple(selected_numeric), df)
+                    
+                    fig = go.Figure(go.Heatmap(
+                        z=corr_matrix.to_numpy(),
+                        x=list(corr_matrix.columns),
+                        y=list(corr_matrix.index),
+                        colorscale="RdBu_r",
+                        zmin=-1,
+                        zmax=1
+                    ))
+                    fig.update_layout(
+                        title="Matriz de Correlación",
+                        template="plotly_white",
+                        yaxis=dict(autorange="reversed")
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+    
+    elif analysis_type == "categorical":
+        _, categorical_cols, _ = get_column_groups(df)
+        if not categorical_cols:
+            st.warning("⚠️ No hay columnas categóricas disponibles")
         else:
-            st.info("📊 Carga un archivo para ver el reporte de validación")
+            selected_categorical = st.selectbox("Seleccionar variable categórica:", categorical_cols)
+            
+            if selected_categorical:
+                col_data = df[selected_categorical]
+                value_counts = col_data.value_counts(sort=True)
+                value_counts = value_counts[value_counts > 0]
+                
+                # Estadísticas básicas
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Valores únicos", len(value_counts))
+                with col2:
+                    st.metric("Más frecuente", value_counts.index[0] if len(value_counts) > 0 else 'N/A')
+                with col3:
+                    st.metric("Frecuencia máxima", int(value_counts.iloc[0]) if len(value_counts) > 0 else 0)
+                
+                # Tabla de frecuencias
+                st.markdown("#### 📊 Tabla de Frecuencias")
+                freq_table = value_counts.reset_index()
+                freq_table.columns = ['Valor', 'Frecuencia']
+                freq_table['Porcentaje'] = (freq_table['Frecuencia'] / len(col_data) * 100).round(2)
+                st.dataframe(freq_table, use_container_width=True)
+                
+                # Gráfico de barras
+                fig = px.bar(
+                    freq_table.head(20),  # Top 20 valores
+                    x='Valor',
+                    y='Frecuencia',
+                    title=f"Distribución de {selected_categorical}"
+                )
+                fig.update_layout(template="plotly_white")
+                st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
-        st.subheader("📊 Estadísticas Descriptivas Avanzadas")
-        
-        # Selector de tipo de análisis descriptivo
-        analysis_type = st.selectbox(
-            "Tipo de análisis:",
-            ["general", "numeric", "categorical", "temporal"],
-            format_func=lambda x: {
-                "general": "📊 Análisis General",
-                "numeric": "🔢 Variables Numéricas",
-                "categorical": "📝 Variables Categóricas",
-                "temporal": "📅 Análisis Temporal"
-            }[x]
-        )
+    elif analysis_type == "temporal":
+        # Detectar columnas de fecha: las que ya son datetime y las de texto con nombre de fecha
+        _, categorical_cols, datetime_cols = get_column_groups(df)
+        text_names = pd.Index(categorical_cols, dtype=object).astype(str).str.lower()
+        named_as_date = text_names.str.contains('date', regex=False) | text_names.str.contains('time', regex=False)
+        date_cols = datetime_cols + [col for col, is_date in zip(categorical_cols, named_as_date) if is_date]
         
-        if analysis_type == "general":
-            # Estadísticas generales
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 🔢 Variables Numéricas")
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
-                if len(numeric_cols) > 0:
-                    numeric_stats = df[numeric_cols].describe()
-                    st.dataframe(numeric_stats.round(4), use_container_width=True)
-                else:
-                    st.info("No hay variables numéricas")
+        if not date_cols:
+            st.warning("⚠️ No se detectaron columnas de fecha/tiempo")
+            st.info("💡 Intenta convertir columnas de texto a formato fecha primero")
+        else:
+            selected_date = st.selectbox("Seleccionar columna de fecha:", date_cols)
             
-            with col2:
-                st.markdown("#### 📝 Variables Categóricas")
-                categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-                if len(categorical_cols) > 0:
-                    cat_info = []
-                    for col in categorical_cols:
-                        cat_info.append({
-                            'Columna': col,
-                            'Únicos': df[col].nunique(),
-                            'Más Frecuente': df[col].mode().iloc[0] if not df[col].mode().empty else 'N/A',
-                            'Frecuencia': df[col].value_counts().iloc[0] if len(df[col].value_counts()) > 0 else 0
-                        })
-                    cat_df = pd.DataFrame(cat_info)
-                    st.dataframe(cat_df, use_container_width=True)
-                else:
-                    st.info("No hay variables categóricas")
-        
-        elif analysis_type == "numeric":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            if not numeric_cols:
-                st.warning("⚠️ No hay columnas numéricas disponibles")
-            else:
-                selected_numeric = st.multiselect(
-                    "Seleccionar variables numéricas:",
-                    numeric_cols,
-                    default=numeric_cols[:5]  # Máximo 5 por defecto
-                )
-                
-                if selected_numeric:
-                    # Estadísticas detalladas
-                    stats_df = df[selected_numeric].describe()
+            if selected_date:
+                # Intentar convertir a datetime si no lo es
+                try:
+                    if not pd.api.types.is_datetime64_any_dtype(df[selected_date]):
+                        # cache=True convierte cada texto de fecha distinto una sola vez
+                        df[selected_date] = pd.to_datetime(df[selected_date], cache=True)
+                        # Cambió el tipo de una columna: recalcular las listas por tipo
+                        invalidate_column_groups()
                     
-                    # Agregar estadísticas adicionales
-                    additional_stats = pd.DataFrame({
-                        col: {
-                            'skewness': df[col].skew(),
-                            'kurtosis': df[col].kurtosis(),
-                            'cv': df[col].std() / df[col].mean() if df[col].mean() != 0 else np.nan
-                        } for col in selected_numeric
-                    }).T
-                    
-                    combined_stats = pd.concat([stats_df, additional_stats.T])
-                    st.dataframe(combined_stats.round(4), use_container_width=True)
-                    
-                    # Matriz de correlación
-                    if len(selected_numeric) > 1:
-                        st.markdown("#### 🔗 Matriz de Correlación")
-                        corr_matrix = df[selected_numeric].corr()
-                        
-                        fig = px.imshow(
-                            corr_matrix,
-                            title="Matriz de Correlación",
-                            color_continuous_scale="RdBu_r",
-                            aspect="auto"
-                        )
-                        fig.update_layout(template="plotly_white")
-                        st.plotly_chart(fig, use_container_width=True)
-        
-        elif analysis_type == "categorical":
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-            if not categorical_cols:
-                st.warning("⚠️ No hay columnas categóricas disponibles")
-            else:
-                selected_categorical = st.selectbox("Seleccionar variable categórica:", categorical_cols)
-                
-                if selected_categorical:
-                    col_data = df[selected_categorical]
+                    # Estadísticas temporales
+                    date_data = df[selected_date].dropna()
                     
-                    # Estadísticas básicas
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        st.metric("Valores únicos", col_data.nunique())
+                        st.metric("Fecha mínima", date_data.min().strftime('%Y-%m-%d'))
                     with col2:
-                        st.metric("Más frecuente", col_data.mode().iloc[0] if not col_data.mode().empty else 'N/A')
+                        st.metric("Fecha máxima", date_data.max().strftime('%Y-%m-%d'))
                     with col3:
-                        st.metric("Frecuencia máxima", col_data.value_counts().iloc[0] if len(col_data.value_counts()) > 0 else 0)
+                        st.metric("Rango (días)", (date_data.max() - date_data.min()).days)
                     
-                    # Tabla de frecuencias
-                    st.markdown("#### 📊 Tabla de Frecuencias")
-                    freq_table = col_data.value_counts().reset_index()
-                    freq_table.columns = ['Valor', 'Frecuencia']
-                    freq_table['Porcentaje'] = (freq_table['Frecuencia'] / len(col_data) * 100).round(2)
-                    st.dataframe(freq_table, use_container_width=True)
+                    # Distribución temporal
+                    st.markdown("#### 📅 Distribución Temporal")
                     
-                    # Gráfico de barras
-                    fig = px.bar(
-                        freq_table.head(20),  # Top 20 valores
-                        x='Valor',
-                        y='Frecuencia',
-                        title=f"Distribución de {selected_categorical}"
+                    # Agrupar por mes sobre los datetime64 sin pasar por objetos Period
+                    monthly_counts = date_data.to_frame().groupby(pd.Grouper(key=selected_date, freq='MS')).size()
+                    
+                    fig = px.line(
+                        x=monthly_counts.index,
+                        y=monthly_counts.values,
+                        title="Distribución de Registros por Mes"
                     )
                     fig.update_layout(template="plotly_white")
                     st.plotly_chart(fig, use_container_width=True)
+                    
+                except Exception as e:
+                    st.error(f"❌ Error al procesar fechas: {str(e)}")
+
+@st.fragment
+def render_visualization_tab(df, file_name):
+    """Renderizar visualizaciones avanzadas"""
+    
+    st.subheader("📈 Visualizaciones Interactivas Avanzadas")
+    
+    # Panel de configuración de visualizaciones mejorado
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        st.markdown("#### ⚙️ Configuración Avanzada")
         
-        elif analysis_type == "temporal":
-            # Detectar columnas de fecha
-            date_cols = []
-            for col in df.columns:
-                if df[col].dtype == 'datetime64[ns]' or 'date' in col.lower() or 'time' in col.lower():
-                    date_cols.append(col)
-            
-            if not date_cols:
-                st.warning("⚠️ No se detectaron columnas de fecha/tiempo")
-                st.info("💡 Intenta convertir columnas de texto a formato fecha primero")
-            else:
-                selected_date = st.selectbox("Seleccionar columna de fecha:", date_cols)
+        viz_category = st.selectbox(
+            "Categoría de gráfico:",
+            ["basic", "statistical", "advanced", "custom"],
+            format_func=VIZ_CATEGORY_LABELS.get
+        )
+        
+        if viz_category == "basic":
+            viz_type = st.selectbox(
+                "Tipo de gráfico:",
+                ["histogram", "scatter", "bar", "line", "pie"],
+                format_func=VIZ_TYPE_LABELS.get
+            )
+        elif viz_category == "statistical":
+            viz_type = st.selectbox(
+                "Tipo de gráfico:",
+                ["box", "violin", "correlation_heatmap", "distribution"],
+                format_func=VIZ_TYPE_LABELS.get
+            )
+        elif viz_category == "advanced":
+            viz_type = st.selectbox(
+                "Tipo de gráfico:",
+                ["parallel_coordinates", "radar", "treemap", "sunburst"],
+                format_func=VIZ_TYPE_LABELS.get
+            )
+        else:  # custom
+            viz_type = st.selectbox(
+                "Tipo de gráfico:",
+                ["3d_scatter", "animated", "subplots", "dashboard"],
+                format_func=VIZ_TYPE_LABELS.get
+            )
+        
+        # Configuración de columnas según el tipo de gráfico
+        numeric_cols, categorical_cols, _ = get_column_groups(df)
+        
+        columns = []
+        if viz_type in ["histogram", "box", "violin", "distribution"]:
+            if numeric_cols:
+                columns = [st.selectbox("Variable numérica:", numeric_cols)]
+        elif viz_type in ["scatter", "line"]:
+            if len(numeric_cols) >= 2:
+                x_col = st.selectbox("Eje X:", numeric_cols)
+                y_col = st.selectbox("Eje Y:", [col for col in numeric_cols if col != x_col])
+                columns = [x_col, y_col]
                 
-                if selected_date:
-                    # Intentar convertir a datetime si no lo es
-                    try:
-                        if df[selected_date].dtype != 'datetime64[ns]':
-                            df[selected_date] = pd.to_datetime(df[selected_date])
-                        
-                        # Estadísticas temporales
-                        date_data = df[selected_date].dropna()
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Fecha mínima", date_data.min().strftime('%Y-%m-%d'))
-                        with col2:
-                            st.metric("Fecha máxima", date_data.max().strftime('%Y-%m-%d'))
-                        with col3:
-                            st.metric("Rango (días)", (date_data.max() - date_data.min()).days)
-                        
-                        # Distribución temporal
-                        st.markdown("#### 📅 Distribución Temporal")
-                        
-                        # Agrupar por mes
-                        monthly_counts = date_data.dt.to_period('M').value_counts().sort_index()
-                        
-                        fig = px.line(
-                            x=monthly_counts.index.astype(str),
-                            y=monthly_counts.values,
-                            title="Distribución de Registros por Mes"
-                        )
-                        fig.update_layout(template="plotly_white")
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error al procesar fechas: {str(e)}")
-    
-    with tab4:
-        st.subheader("📈 Visualizaciones Interactivas Avanzadas")
+                # Opción de color
+                if categorical_cols:
+                    color_col = st.selectbox("Color por:", ["Ninguno"] + categorical_cols)
+                    if color_col != "Ninguno":
+                        columns.append(color_col)
+        elif viz_type == "bar":
+            if categorical_cols and numeric_cols:
+                x_col = st.selectbox("Categorías:", categorical_cols)
+                y_col = st.selectbox("Valores:", numeric_cols)
+                columns = [x_col, y_col]
+        elif viz_type == "pie":
+            if categorical_cols:
+                columns = [st.selectbox("Variable categórica:", categorical_cols)]
         
-        # Panel de configuración de visualizaciones mejorado
-        col1, col2 = st.columns([1, 3])
+        # Configuraciones adicionales
+        st.markdown("##### 🎨 Estilo")
+        color_palette = st.selectbox(
+            "Paleta de colores:",
+            ["plotly", "viridis", "plasma", "inferno", "magma", "Set1", "Set2", "Set3"],
+            index=0
+        )
         
-        with col1:
-            st.markdown("#### ⚙️ Configuración Avanzada")
+        plot_theme = st.selectbox(
+            "Tema:",
+            ["plotly_white", "plotly_dark", "ggplot2", "seaborn", "simple_white"],
+            index=0
+        )
+        
+        # Botón para generar gráfico
+        if st.button("🎨 Generar Visualización", type="primary"):
+            if not columns:
+                st.error("❌ Selecciona las columnas necesarias")
+            else:
+                with st.spinner("Generando visualización..."):
+                    fig = build_visualization(df, viz_type, columns, color_palette, plot_theme)
+                    if fig:
+                        st.session_state['current_viz'] = fig
+                        st.session_state['viz_config'] = {
+                            'type': viz_type,
+                            'columns': columns,
+                            'palette': color_palette,
+                            'theme': plot_theme
+                        }
+    
+    with col2:
+        st.markdown("#### 📊 Visualización")
+        
+        if 'current_viz' in st.session_state:
+            fig = st.session_state['current_viz']
+            st.plotly_chart(fig, use_container_width=True)
             
-            viz_category = st.selectbox(
-                "Categoría de gráfico:",
-                ["basic", "statistical", "advanced", "custom"],
-                format_func=lambda x: {
-                    "basic": "📊 Básicos",
-                    "statistical": "📈 Estadísticos",
-                    "advanced": "🎯 Avanzados",
-                    "custom": "🎨 Personalizados"
-                }[x]
-            )
+            # Información de la visualización
+            if 'viz_config' in st.session_state:
+                config = st.session_state['viz_config']
+                st.info(f"📊 **Tipo:** {config['type']} | **Columnas:** {', '.join(config['columns'])} | **Tema:** {config['theme']}")
             
-            if viz_category == "basic":
-                viz_type = st.selectbox(
-                    "Tipo de gráfico:",
-                    ["histogram", "scatter", "bar", "line", "pie"],
-                    format_func=lambda x: {
-                        "histogram": "📊 Histograma",
-                        "scatter": "🔵 Dispersión",
-                        "bar": "📊 Barras",
-                        "line": "📈 Líneas",
-                        "pie": "🥧 Circular"
-                    }[x]
-                )
-            elif viz_category == "statistical":
-                viz_type = st.selectbox(
-                    "Tipo de gráfico:",
-                    ["box", "violin", "correlation_heatmap", "distribution"],
-                    format_func=lambda x: {
-                        "box": "📦 Caja",
-                        "violin": "🎻 Violín",
-                        "correlation_heatmap": "🔥 Mapa de Calor",
-                        "distribution": "📊 Distribución"
-                    }[x]
-                )
-            elif viz_category == "advanced":
-                viz_type = st.selectbox(
-                    "Tipo de gráfico:",
-                    ["parallel_coordinates", "radar", "treemap", "sunburst"],
-                    format_func=lambda x: {
-                        "parallel_coordinates": "🔗 Coordenadas Paralelas",
-                        "radar": "🎯 Radar",
-                        "treemap": "🌳 Mapa de Árbol",
-                        "sunburst": "☀️ Sunburst"
-                    }[x]
-                )
-            else:  # custom
-                viz_type = st.selectbox(
-                    "Tipo de gráfico:",
-                    ["3d_scatter", "animated", "subplots", "dashboard"],
-                    format_func=lambda x: {
-                        "3d_scatter": "🌐 Dispersión 3D",
-                        "animated": "🎬 Animado",
-                        "subplots": "📊 Subgráficos",
-                        "dashboard": "📋 Dashboard"
-                    }[x]
-                )
+            # Opciones de exportación
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                image_format = st.radio("Formato de imagen:", ["png", "webp"], horizontal=True,
+                                        format_func=str.upper, key="viz_image_format")
+                if st.button("📷 Exportar Imagen"):
+                    # Kaleido solo se invoca la primera vez para cada figura y formato
+                    img_bytes = _figure_image(pio.to_json(fig, validate=False), image_format)
+                    st.download_button(
+                        label=f"⬇️ Descargar {image_format.upper()}",
+                        data=img_bytes,
+                        file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.{image_format}",
+                        mime=f"image/{image_format}"
+                    )
             
-            # Configuración de columnas según el tipo de gráfico
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            with col2:
+                if st.button("📄 Exportar HTML"):
+                    # La figura ya viene validada de create_advanced_visualization
+                    html_str = pio.to_html(fig, include_plotlyjs='cdn', include_mathjax=False, validate=False)
+                    st.download_button(
+                        label="⬇️ Descargar HTML",
+                        data=html_str,
+                        file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
+                        mime="text/html"
+                    )
             
-            columns = []
-            if viz_type in ["histogram", "box", "violin", "distribution"]:
-                if numeric_cols:
-                    columns = [st.selectbox("Variable numérica:", numeric_cols)]
-            elif viz_type in ["scatter", "line"]:
-                if len(numeric_cols) >= 2:
-                    x_col = st.selectbox("Eje X:", numeric_cols)
-                    y_col = st.selectbox("Eje Y:", [col for col in numeric_cols if col != x_col])
-                    columns = [x_col, y_col]
-                    
-                    # Opción de color
-                    if categorical_cols:
-                        color_col = st.selectbox("Color por:", ["Ninguno"] + categorical_cols)
-                        if color_col != "Ninguno":
-                            columns.append(color_col)
-            elif viz_type == "bar":
-                if categorical_cols and numeric_cols:
-                    x_col = st.selectbox("Categorías:", categorical_cols)
-                    y_col = st.selectbox("Valores:", numeric_cols)
-                    columns = [x_col, y_col]
-            elif viz_type == "pie":
-                if categorical_cols:
-                    columns = [st.selectbox("Variable categórica:", categorical_cols)]
+            with col3:
+                if st.button("📊 Exportar JSON"):
+                    json_str = pio.to_json(fig, validate=False)
+                    st.download_button(
+                        label="⬇️ Descargar JSON",
+                        data=json_str,
+                        file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                        mime="application/json"
+                    )
             
-            # Configuraciones adicionales
-            st.markdown("##### 🎨 Estilo")
-            color_palette = st.selectbox(
-                "Paleta de colores:",
-                ["plotly", "viridis", "plasma", "inferno", "magma", "Set1", "Set2", "Set3"],
-                index=0
-            )
+            if st.button("📥 Exportar Todo"):
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+                with st.spinner("Preparando exportaciones..."):
+                    # El JSON sirve a la vez de exportación y de clave de la imagen cacheada;
+                    # el HTML se arma en otro hilo mientras Kaleido genera la imagen
+                    json_str = pio.to_json(fig, validate=False)
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        html_future = executor.submit(
+                            pio.to_html, fig, include_plotlyjs='cdn', include_mathjax=False, validate=False
+                        )
+                        img_bytes = _figure_image(json_str, image_format)
+                        html_str = html_future.result()
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.download_button(
+                        label=f"⬇️ Descargar {image_format.upper()}",
+                        data=img_bytes,
+                        file_name=f"grafico_{timestamp}.{image_format}",
+                        mime=f"image/{image_format}",
+                        key="download_all_image"
+                    )
+                with col2:
+                    st.download_button(
+                        label="⬇️ Descargar HTML",
+                        data=html_str,
+                        file_name=f"grafico_{timestamp}.html",
+                        mime="text/html",
+                        key="download_all_html"
+                    )
+                with col3:
+                    st.download_button(
+                        label="⬇️ Descargar JSON",
+                        data=json_str,
+                        file_name=f"grafico_{timestamp}.json",
+                        mime="application/json",
+                        key="download_all_json"
+                    )
+        else:
+            st.info("👈 Configura y genera una visualización para mostrar aquí")
             
-            plot_theme = st.selectbox(
-                "Tema:",
-                ["plotly_white", "plotly_dark", "ggplot2", "seaborn", "simple_white"],
-                index=0
-            )
+            # Mostrar galería de ejemplos
+            st.markdown("##### 🖼️ Galería de Ejemplos")
             
-            # Botón para generar gráfico
-            if st.button("🎨 Generar Visualización", type="primary"):
-                if not columns:
-                    st.error("❌ Selecciona las columnas necesarias")
-                else:
-                    with st.spinner("Generando visualización..."):
-                        fig = create_advanced_visualization(df, viz_type, columns, color_palette, plot_theme)
-                        if fig:
-                            st.session_state['current_viz'] = fig
-                            st.session_state['viz_config'] = {
-                                'type': viz_type,
-                                'columns': columns,
-                                'palette': color_palette,
-                                'theme': plot_theme
-                            }
+            cols = st.columns(3)
+            for i, img_url in enumerate(EXAMPLE_IMAGE_URLS):
+                with cols[i]:
+                    img_bytes = _fetch_example_image(img_url)
+                    if img_bytes is None:
+                        st.info(f"Ejemplo {i+1}")
+                        continue
+                    try:
+                        st.image(img_bytes, caption=f"Ejemplo {i+1}", use_column_width=True)
+                    except:
+                        st.info(f"Ejemplo {i+1}")
+
+@st.fragment
+def render_export_tab(df, file_name, validation_report):
+    """Renderizar exportación de resultados y reportes"""
+    
+    st.subheader("📤 Exportar Resultados y Reportes")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 💾 Exportar Datos")
         
-        with col2:
-            st.markdown("#### 📊 Visualización")
-            
-            if 'current_viz' in st.session_state:
-                fig = st.session_state['current_viz']
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Información de la visualización
-                if 'viz_config' in st.session_state:
-                    config = st.session_state['viz_config']
-                    st.info(f"📊 **Tipo:** {config['type']} | **Columnas:** {', '.join(config['columns'])} | **Tema:** {config['theme']}")
+        # Opciones de exportación de datos
+        export_format = st.selectbox(
+            "Formato de exportación:",
+            ["excel", "csv", "json", "parquet"],
+            format_func=EXPORT_FORMAT_LABELS.get
+        )
+        
+        include_stats = st.checkbox("Incluir estadísticas descriptivas", value=True)
+        include_validation = st.checkbox("Incluir reporte de validación", value=True)
+        
+        if st.button("📊 Generar Exportación Completa", type="primary"):
+            with st.spinner("Generando archivo de exportación..."):
+                export_data = create_comprehensive_export(
+                    df, file_name, export_format, include_stats, include_validation, validation_report
+                )
                 
-                # Opciones de exportación
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if st.button("📷 Exportar PNG"):
-                        img_bytes = fig.to_image(format="png", width=1200, height=800)
+                if export_data:
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+                    filename = f"analisis_completo_{file_name}_{timestamp}.{export_format}"
+                    
+                    if export_format == "excel":
                         st.download_button(
-                            label="⬇️ Descargar PNG",
-                            data=img_bytes,
-                            file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.png",
-                            mime="image/png"
+                            label="⬇️ Descargar Excel Completo",
+                            data=export_data,
+                            file_name=filename,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                         )
-                
-                with col2:
-                    if st.button("📄 Exportar HTML"):
-                        html_str = fig.to_html(include_plotlyjs='cdn')
+                    elif export_format == "csv":
                         st.download_button(
-                            label="⬇️ Descargar HTML",
-                            data=html_str,
-                            file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
-                            mime="text/html"
+                            label="⬇️ Descargar CSV",
+                            data=export_data,
+                            file_name=filename,
+                            mime="text/csv"
                         )
-                
-                with col3:
-                    if st.button("📊 Exportar JSON"):
-                        json_str = fig.to_json()
+                    elif export_format == "json":
                         st.download_button(
                             label="⬇️ Descargar JSON",
-                            data=json_str,
-                            file_name=f"grafico_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                            data=export_data,
+                            file_name=filename,
                             mime="application/json"
                         )
-            else:
-                st.info("👈 Configura y genera una visualización para mostrar aquí")
-                
-                # Mostrar galería de ejemplos
-                st.markdown("##### 🖼️ Galería de Ejemplos")
-                
-                example_images = [
-                    "https://plotly.com/~plotly2_demo/542.png",
-                    "https://plotly.com/~plotly2_demo/543.png",
-                    "https://plotly.com/~plotly2_demo/544.png"
-                ]
+    
+    with col2:
+        st.markdown("#### 📊 Generar Reporte")
+        
+        # Opciones de reporte
+        report_sections = st.multiselect(
+            "Secciones del reporte:",
+            [
+                "resumen_ejecutivo",
+                "validacion_datos", 
+                "estadisticas_descriptivas",
+                "visualizaciones",
+                "analisis_avanzados",
+                "conclusiones"
+            ],
+            default=[
+                "resumen_ejecutivo",
+                "validacion_datos",
+                "estadisticas_descriptivas"
+            ],
+            format_func=REPORT_SECTION_LABELS.get
+        )
+        
+        report_format = st.selectbox(
+            "Formato del reporte:",
+            ["html", "markdown", "pdf"],
+            format_func=REPORT_FORMAT_LABELS.get
+        )
+        
+        if st.button("📋 Generar Reporte Completo", type="primary"):
+            with st.spinner("Generando reporte..."):
+                report_content = generate_comprehensive_report(
+                    df, file_name, validation_report, report_sections, report_format
+                )
                 
-                cols = st.columns(3)
-                for i, img_url in enumerate(example_images):
-                    with cols[i]:
-                        try:
-                            st.image(img_url, caption=f"Ejemplo {i+1}", use_column_width=True)
-                        except:
-                            st.info(f"Ejemplo {i+1}")
+                if report_content:
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+                    filename = f"reporte_analisis_{file_name}_{timestamp}.{report_format}"
+                    
+                    if report_format == "html":
+                        st.download_button(
+                            label="⬇️ Descargar Reporte HTML",
+                            data=report_content,
+                            file_name=filename,
+                            mime="text/html"
+                        )
+                    elif report_format == "markdown":
+                        st.download_button(
+                            label="⬇️ Descargar Reporte Markdown",
+                            data=report_content,
+                            file_name=filename,
+                            mime="text/markdown"
+                        )
+                    elif report_format == "pdf":
+                        st.info("🚧 Exportación a PDF en desarrollo")
+    
+    # Historial de exportaciones
+    st.markdown("---")
+    st.markdown("#### 📚 Historial de Exportaciones")
+    
+    if 'export_history' not in st.session_state:
+        st.session_state.export_history = []
+    
+    if st.session_state.export_history:
+        for i, export in enumerate(st.session_state.export_history):
+            st.text(f"📄 {export['filename']} - {export['timestamp']} - {export['format']}")
+    else:
+        st.info("📝 No hay exportaciones en el historial")
+
+# Contenido principal
+if 'data' in st.session_state and st.session_state['data'] is not None:
+    df = st.session_state['data']
+    file_name = st.session_state.get('file_name', 'archivo_cargado')
+    validation_report = st.session_state.get('validation_report', {})
+    # Identifica el DataFrame cargado para las funciones cacheadas
+    df_key = get_df_key(df, file_name)
+    
+    # Tabs principales mejorados
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+        "📋 Vista General", 
+        "🔍 Validación de Datos",
+        "📊 Estadísticas Descriptivas", 
+        "📈 Visualizaciones", 
+        "🔬 Análisis Avanzados",
+        "📤 Exportar Resultados"
+    ])
+    
+    with tab1:
+        render_general_tab(df, file_name)
+    
+    with tab2:
+        render_validation_tab(validation_report)
+    
+    with tab3:
+        render_statistics_tab(df, df_key)
+    
+    with tab4:
+        render_visualization_tab(df, file_name)
     
     with tab5:
         # Tab de análisis avanzados (importado del módulo separado)
         render_advanced_analysis_tab(df, file_name)
     
     with tab6:
-        st.subheader("📤 Exportar Resultados y Reportes")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 💾 Exportar Datos")
-            
-            # Opciones de exportación de datos
-            export_format = st.selectbox(
-                "Formato de exportación:",
-                ["excel", "csv", "json", "parquet"],
-                format_func=lambda x: {
-                    "excel": "📊 Excel (.xlsx)",
-                    "csv": "📄 CSV (.csv)",
-                    "json": "📋 JSON (.json)",
-                    "parquet": "🗃️ Parquet (.parquet)"
-                }[x]
-            )
-            
-            include_stats = st.checkbox("Incluir estadísticas descriptivas", value=True)
-            include_validation = st.checkbox("Incluir reporte de validación", value=True)
-            
-            if st.button("📊 Generar Exportación Completa", type="primary"):
-                with st.spinner("Generando archivo de exportación..."):
-                    export_data = create_comprehensive_export(
-                        df, file_name, export_format, include_stats, include_validation, validation_report
-                    )
-                    
-                    if export_data:
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-                        filename = f"analisis_completo_{file_name}_{timestamp}.{export_format}"
-                        
-                        if export_format == "excel":
-                            st.download_button(
-                                label="⬇️ Descargar Excel Completo",
-                                data=export_data,
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                            )
-                        elif export_format == "csv":
-                            st.download_button(
-                                label="⬇️ Descargar CSV",
-                                data=export_data,
-                                file_name=filename,
-                                mime="text/csv"
-                            )
-                        elif export_format == "json":
-                            st.download_button(
-                                label="⬇️ Descargar JSON",
-                                data=export_data,
-                                file_name=filename,
-                                mime="application/json"
-                            )
-        
-        with col2:
-            st.markdown("#### 📊 Generar Reporte")
-            
-            # Opciones de reporte
-            report_sections = st.multiselect(
-                "Secciones del reporte:",
-                [
-                    "resumen_ejecutivo",
-                    "validacion_datos", 
-                    "estadisticas_descriptivas",
-                    "visualizaciones",
-                    "analisis_avanzados",
-                    "conclusiones"
-                ],
-                default=[
-                    "resumen_ejecutivo",
-                    "validacion_datos",
-                    "estadisticas_descriptivas"
-                ],
-                format_func=lambda x: {
-                    "resumen_ejecutivo": "📋 Resumen Ejecutivo",
-                    "validacion_datos": "🔍 Validación de Datos",
-                    "estadisticas_descriptivas": "📊 Estadísticas Descriptivas",
-                    "visualizaciones": "📈 Visualizaciones",
-                    "analisis_avanzados": "🔬 Análisis Avanzados",
-                    "conclusiones": "💡 Conclusiones"
-                }[x]
-            )
-            
-            report_format = st.selectbox(
-                "Formato del reporte:",
-                ["html", "markdown", "pdf"],
-                format_func=lambda x: {
-                    "html": "🌐 HTML",
-                    "markdown": "📝 Markdown",
-                    "pdf": "📄 PDF"
-                }[x]
-            )
-            
-            if st.button("📋 Generar Reporte Completo", type="primary"):
-                with st.spinner("Generando reporte..."):
-                    report_content = generate_comprehensive_report(
-                        df, file_name, validation_report, report_sections, report_format
-                    )
-                    
-                    if report_content:
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-                        filename = f"reporte_analisis_{file_name}_{timestamp}.{report_format}"
-                        
-                        if report_format == "html":
-                            st.download_button(
-                                label="⬇️ Descargar Reporte HTML",
-                                data=report_content,
-                                file_name=filename,
-                                mime="text/html"
-                            )
-                        elif report_format == "markdown":
-                            st.download_button(
-                                label="⬇️ Descargar Reporte Markdown",
-                                data=report_content,
-                                file_name=filename,
-                                mime="text/markdown"
-                            )
-                        elif report_format == "pdf":
-                            st.info("🚧 Exportación a PDF en desarrollo")
-        
-        # Historial de exportaciones
-        st.markdown("---")
-        st.markdown("#### 📚 Historial de Exportaciones")
-        
-        if 'export_history' not in st.session_state:
-            st.session_state.export_history = []
-        
-        if st.session_state.export_history:
-            for i, export in enumerate(st.session_state.export_history):
-                st.text(f"📄 {export['filename']} - {export['timestamp']} - {export['format']}")
-        else:
-            st.info("📝 No hay exportaciones en el historial")
+        render_export_tab(df, file_name, validation_report)
 
 else:
     # Pantalla de bienvenida mejorada
@@ -1078,35 +1491,30 @@ else:
     
     with col1:
         st.markdown("### 🔌 Estado de Conexiones")
-        try:
-            response = requests.get(f"{analysis_module.file_api_url}/status", timeout=3)
-            if response.status_code == 200:
-                st.success("✅ Explorador de archivos conectado")
-                
-                # Obtener estadísticas del explorador
-                stats_response = requests.get(f"{analysis_module.file_api_url}/stats", timeout=3)
-                if stats_response.status_code == 200:
-                    stats = stats_response.json()
-                    st.info(f"📁 {stats['total_files']} archivos disponibles")
-                    st.info(f"💾 {stats['total_size_human']} de datos")
-            else:
-                st.error("❌ Explorador de archivos no responde")
-        except:
+        explorer_status = _cached_explorer_status(analysis_module.file_api_url)
+        if not explorer_status["reachable"]:
             st.error("❌ No se puede conectar al explorador de archivos")
             st.info("💡 Inicia el explorador primero:\n`cd ../file_explorer && ./start_filebrowser.sh`")
+        elif explorer_status["status_ok"]:
+            st.success("✅ Explorador de archivos conectado")
+            
+            # Estadísticas del explorador
+            stats = explorer_status["stats"]
+            if stats:
+                st.info(f"📁 {stats['total_files']} archivos disponibles")
+                st.info(f"💾 {stats['total_size_human']} de datos")
+        else:
+            st.error("❌ Explorador de archivos no responde")
     
     with col2:
         st.markdown("### 📊 Archivos Disponibles")
         if available_files["count"] > 0:
             st.success(f"📁 {available_files['count']} archivos analizables")
             
-            # Mostrar tipos de archivo
-            extensions = {}
-            for file in available_files["files"]:
-                ext = file["extension"].upper()
-                extensions[ext] = extensions.get(ext, 0) + 1
+            # Mostrar tipos de archivo, del más frecuente al menos frecuente
+            extensions = Counter(file["extension"].upper() for file in available_files["files"])
             
-            for ext, count in extensions.items():
+            for ext, count in extensions.most_common():
                 st.text(f"📄 {ext}: {count} archivos")
         else:
             st.warning("⚠️ No hay archivos disponibles")
@@ -1145,27 +1553,54 @@ st.markdown("""
 
 # Funciones auxiliares
 
+def _write_sheet_rows(workbook, sheet_name, frame, index=False):
+    """Escribir un DataFrame en una hoja fila por fila, como exige el modo constant_memory"""
+    worksheet = workbook.add_worksheet(sheet_name)
+    if index:
+        frame = frame.reset_index()
+        header = [''] + [str(col) for col in frame.columns[1:]]
+    else:
+        header = [str(col) for col in frame.columns]
+    worksheet.write_row(0, 0, header)
+    
+    # None en lugar de NaN/NaT para que la celda quede vacía
+    values = frame.astype(object).where(frame.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, row)
+
 def create_comprehensive_export(df, file_name, export_format, include_stats, include_validation, validation_report):
     """Crear exportación completa de datos y análisis"""
     try:
         if export_format == "excel":
+            import xlsxwriter
+            
             output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Hoja principal con datos
-                df.to_excel(writer, sheet_name='Datos', index=False)
-                
-                if include_stats:
-                    # Hoja con estadísticas descriptivas
-                    numeric_cols = df.select_dtypes(include=[np.number]).columns
-                    if len(numeric_cols) > 0:
-                        stats_df = df[numeric_cols].describe()
-                        stats_df.to_excel(writer, sheet_name='Estadísticas')
-                
-                if include_validation and validation_report:
-                    # Hoja con reporte de validación
-                    validation_summary = pd.DataFrame([validation_report['summary']])
-                    validation_summary.to_excel(writer, sheet_name='Validación', index=False)
+            # constant_memory vuelca cada fila al archivo en lugar de retener todas las celdas;
+            # pandas escribe por columnas, así que las hojas se escriben fila a fila
+            workbook = xlsxwriter.Workbook(output, {
+                'constant_memory': True,
+                'use_zip64': True,
+                'nan_inf_to_errors': True,
+                'remove_timezone': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+            })
             
+            # Hoja principal con datos
+            _write_sheet_rows(workbook, 'Datos', df)
+            
+            if include_stats:
+                # Hoja con estadísticas descriptivas
+                numeric_cols, _, _ = get_column_groups(df)
+                if len(numeric_cols) > 0:
+                    stats_df = _describe_numeric(get_df_key(df, file_name), tuple(numeric_cols), df)
+                    _write_sheet_rows(workbook, 'Estadísticas', stats_df, index=True)
+            
+            if include_validation and validation_report:
+                # Hoja con reporte de validación
+                validation_summary = pd.DataFrame([validation_report['summary'].to_dict()])
+                _write_sheet_rows(workbook, 'Validación', validation_summary)
+            
+            workbook.close()
             return output.getvalue()
             
         elif export_format == "csv":
@@ -1179,18 +1614,36 @@ def create_comprehensive_export(df, file_name, export_format, include_stats, inc
                     'rows': len(df),
                     'columns': len(df.columns)
                 },
-                'data': df.to_dict('records')
+                # Las filas se codifican aparte con el serializador en C de pandas y se
+                # insertan al final, sin crear un dict de Python por fila
+                'data': None
             }
             
             if include_stats:
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
+                numeric_cols, _, _ = get_column_groups(df)
                 if len(numeric_cols) > 0:
-                    export_data['statistics'] = df[numeric_cols].describe().to_dict()
+                    export_data['statistics'] = _describe_numeric(
+                        get_df_key(df, file_name), tuple(numeric_cols), df
+                    ).to_dict()
             
             if include_validation and validation_report:
                 export_data['validation'] = validation_report
             
-            return json.dumps(export_data, indent=2, default=str, ensure_ascii=False)
+            # Los mensajes de validación (Msg) saben serializarse; el resto como texto
+            default = lambda obj: obj.to_dict() if hasattr(obj, 'to_dict') else str(obj)
+            if ORJSON_AVAILABLE:
+                # orjson serializa escalares de numpy y dataclasses de forma nativa
+                export_json = orjson.dumps(
+                    export_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                    default=default
+                ).decode('utf-8')
+            else:
+                export_json = json.dumps(export_data, indent=2, ensure_ascii=False, default=default)
+            
+            records_json = df.to_json(orient='records', date_format='iso', force_ascii=False)
+            # Con sangría 2 la clave de primer nivel es única a esa profundidad
+            return export_json.replace('\n  "data": null', '\n  "data": ' + records_json, 1)
         
         return None
         
@@ -1198,8 +1651,27 @@ def create_comprehensive_export(df, file_name, export_format, include_stats, inc
         st.error(f"❌ Error al crear exportación: {str(e)}")
         return None
 
+def _markdown_table(frame):
+    """Tabla Markdown de un DataFrame con índice, sin pasar por tabulate"""
+    cells = frame.round(4).astype(str)
+    header = [''] + [str(col) for col in cells.columns]
+    lines = [
+        "| " + " | ".join(cell.replace('|', '\\|') for cell in header) + " |",
+        "|:---|" + "---:|" * len(cells.columns)
+    ]
+    lines.extend(
+        "| " + " | ".join(str(cell).replace('|', '\\|') for cell in row) + " |"
+        for row in cells.itertuples(index=True, name=None)
+    )
+    return "\n".join(lines)
+
 def generate_comprehensive_report(df, file_name, validation_report, sections, report_format):
     """Generar reporte completo de análisis"""
+    # Memoria calculada al cargar el archivo (store_loaded_data); deep=True recorre cada celda de texto
+    mem_mb = st.session_state.get('mem_mb')
+    if mem_mb is None:
+        mem_mb = df.memory_usage(deep=True).sum() / 1024**2
+    
     try:
         if report_format == "markdown":
             report_lines = []
@@ -1214,7 +1686,7 @@ def generate_comprehensive_report(df, file_name, validation_report, sections, re
                 report_lines.append(f"- **Archivo analizado:** {file_name}")
                 report_lines.append(f"- **Número de filas:** {len(df):,}")
                 report_lines.append(f"- **Número de columnas:** {len(df.columns)}")
-                report_lines.append(f"- **Tamaño en memoria:** {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+                report_lines.append(f"- **Tamaño en memoria:** {mem_mb:.1f} MB")
                 report_lines.append("")
             
             if "validacion_datos" in sections and validation_report:
@@ -1228,53 +1700,57 @@ def generate_comprehensive_report(df, file_name, validation_report, sections, re
             
             if "estadisticas_descriptivas" in sections:
                 report_lines.append("## 📊 Estadísticas Descriptivas")
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
+                numeric_cols, _, _ = get_column_groups(df)
                 if len(numeric_cols) > 0:
-                    stats_df = df[numeric_cols].describe()
+                    stats_df = _describe_numeric(get_df_key(df, file_name), tuple(numeric_cols), df)
                     report_lines.append("### Variables Numéricas")
-                    report_lines.append(stats_df.to_markdown())
+                    if stats_df.shape[1] > REPORT_MARKDOWN_MAX_COLS:
+                        # Tabla muy ancha: resumen por variable y el detalle completo como CSV plegable
+                        report_lines.append(_markdown_table(stats_df.T[['mean', 'std', 'min', 'max']]))
+                        report_lines.append("")
+                        report_lines.append("<details><summary>Estadísticas completas (CSV)</summary>")
+                        report_lines.append("")
+                        report_lines.append("```csv")
+                        report_lines.append(stats_df.round(4).to_csv().rstrip("\n"))
+                        report_lines.append("```")
+                        report_lines.append("")
+                        report_lines.append("</details>")
+                    else:
+                        report_lines.append(_markdown_table(stats_df))
                     report_lines.append("")
             
             return "\n".join(report_lines)
             
         elif report_format == "html":
-            # Generar reporte HTML
-            html_content = f"""
+            # Generar reporte HTML por partes y unirlas al final
+            html_parts = [f"""
             <!DOCTYPE html>
             <html>
             <head>
-                <title>Reporte de Análisis - {file_name}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                    h1, h2 {{ color: #2196F3; }}
-                    table {{ border-collapse: collapse; width: 100%; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                    th {{ background-color: #f2f2f2; }}
-                    .metric {{ background: #f8f9fa; padding: 10px; margin: 10px 0; border-left: 4px solid #2196F3; }}
-                </style>
+                <title>Reporte de Análisis - {file_name}</title>""", REPORT_HTML_STYLE, f"""
             </head>
             <body>
                 <h1>📊 Reporte de Análisis - {file_name}</h1>
                 <p><strong>Fecha:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            """
+            """]
             
             if "resumen_ejecutivo" in sections:
-                html_content += f"""
+                html_parts.append(f"""
                 <h2>📋 Resumen Ejecutivo</h2>
                 <div class="metric">
                     <strong>Archivo:</strong> {file_name}<br>
                     <strong>Filas:</strong> {len(df):,}<br>
                     <strong>Columnas:</strong> {len(df.columns)}<br>
-                    <strong>Memoria:</strong> {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB
+                    <strong>Memoria:</strong> {mem_mb:.1f} MB
                 </div>
-                """
+                """)
             
-            html_content += """
+            html_parts.append("""
             </body>
             </html>
-            """
+            """)
             
-            return html_content
+            return "".join(html_parts)
         
         return None
         
@@ -23,6 +23,21 @@ from datetime import datetime
 import io
 import base64
 
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# FAST_IO=1 activa los lectores multihilo de pyarrow y calamine cuando están instalados
+FAST_IO = os.environ.get('FAST_IO') == '1'
+
 # Configuración de la página
 st.set_page_config(
     page_title="Dashboard Tesis Pro - Análisis Estadístico",
@@ -118,9 +133,19 @@ class DataAnalysisModule:
             
             # Cargar datos según el tipo de archivo
             if extension == "csv":
-                df = pd.read_csv(full_path)
+                if FAST_IO and PYARROW_AVAILABLE:
+                    # Motor pyarrow a través de pandas: lectura multihilo con la misma
+                    # detección de nulos ('', 'NA', ...) que el lector por defecto
+                    df = pd.read_csv(full_path, engine='pyarrow')
+                    # Encabezados vacíos como 'Unnamed: N', igual que el lector por defecto
+                    df.columns = [f'Unnamed: {i}' if name == '' else name for i, name in enumerate(df.columns)]
+                else:
+                    df = pd.read_csv(full_path)
             elif extension in ["xlsx", "xls"]:
-                df = pd.read_excel(full_path)
+                if FAST_IO and CALAMINE_AVAILABLE:
+                    df = pd.read_excel(full_path, engine='calamine')
+                else:
+                    df = pd.read_excel(full_path)
             elif extension == "json":
                 with open(full_path, 'r') as f:
                     data = json.load(f)
@@ -129,7 +154,11 @@ class DataAnalysisModule:
                     else:
                         df = pd.json_normalize(data)
             elif extension == "parquet":
-                df = pd.read_parquet(full_path)
+                if FAST_IO and PYARROW_AVAILABLE:
+                    table = pq.read_table(full_path, use_threads=True)
+                    df = table.to_pandas(split_blocks=True, self_destruct=True)
+                else:
+                    df = pd.read_parquet(full_path)
             else:
                 st.error(f"❌ Formato de archivo no soportado: {extension}")
                 return None
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Dashboard Tesis Pro - Kernels numéricos para las estadísticas descriptivas
+
+Funciones de bajo nivel usadas por el panel principal al recalcular
+asimetría, curtosis y coeficiente de variación. Si numba está instalado se
+compilan a código nativo; si no, el panel usa los métodos de pandas.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Sin fastmath: esa opción asume que no hay NaN y eliminaría los np.isnan
+    @njit(cache=True, parallel=True)
+    def moments(a):
+        """Conteo, media, desviación (ddof=1), asimetría y curtosis en exceso ignorando NaN
+
+        Usa las mismas fórmulas corregidas por sesgo que pandas (skew/kurt).
+        """
+        n_total = a.shape[0]
+        count = 0
+        total = 0.0
+        for i in prange(n_total):
+            x = a[i]
+            if not np.isnan(x):
+                count += 1
+                total += x
+
+        if count == 0:
+            return 0, np.nan, np.nan, np.nan, np.nan
+
+        mean = total / count
+        m2 = 0.0
+        m3 = 0.0
+        m4 = 0.0
+        for i in prange(n_total):
+            x = a[i]
+            if not np.isnan(x):
+                d = x - mean
+                d2 = d * d
+                m2 += d2
+                m3 += d2 * d
+                m4 += d2 * d2
+
+        n = float(count)
+        std = np.sqrt(m2 / (n - 1.0)) if count > 1 else np.nan
+
+        if count < 3:
+            skew = np.nan
+        elif m2 == 0.0:
+            skew = 0.0
+        else:
+            skew = np.sqrt(n * (n - 1.0)) / (n - 2.0) * (m3 / n) / (m2 / n) ** 1.5
+
+        if count < 4:
+            kurt = np.nan
+        else:
+            denom = (n - 2.0) * (n - 3.0) * m2 * m2
+            if denom == 0.0:
+                kurt = 0.0
+            else:
+                adj = 3.0 * (n - 1.0) ** 2 / ((n - 2.0) * (n - 3.0))
+                kurt = n * (n + 1.0) * (n - 1.0) * m4 / denom - adj
+
+        return count, mean, std, skew, kurt
+
+    # Compilar al importar para no pagar el JIT en la primera interacción
+    moments(np.arange(4, dtype=np.float64))
@@ -14,8 +14,8 @@ Este módulo implementa análisis estadísticos avanzados:
 import pandas as pd
 import numpy as np
 from scipy import stats
-from scipy.stats import chi2_contingency, pearsonr, spearmanr, kendalltau
-from sklearn.cluster import KMeans, AgglomerativeClustering
+from scipy.stats import chi2_contingency, spearmanr, kendalltau
+from sklearn.cluster import KMeans, MiniBatchKMeans, AgglomerativeClustering
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LinearRegression, LogisticRegression
 from sklearn.metrics import r2_score, mean_squared_error, classification_report
@@ -26,16 +26,33 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
+from stat_analysis_kernels import pearson_r
 warnings.filterwarnings('ignore')
 
+# Columnas con más categorías se omiten en chi-cuadrado por parejas: su tabla de
+# contingencia crece con el producto de cardinalidades y el test pierde sentido
+CHI_SQUARE_MAX_CATEGORIES = 50
+
+def _json_default(obj):
+    """Serializar arrays y escalares de numpy como listas/números de Python para json.dumps"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    return str(obj)
+
 class StatisticalAnalysis:
     def __init__(self):
         self.results_history = []
     
-    def t_test_one_sample(self, data, column, test_value, alpha=0.05):
-        """Prueba t de una muestra"""
+    def t_test_one_sample(self, data, column, test_value, alpha=0.05, values=None):
+        """Prueba t de una muestra
+        
+        `values` (opcional) es la columna ya convertida a ndarray float64 con NaN;
+        si se pasa, no se vuelve a indexar el DataFrame.
+        """
         try:
-            sample_data = data[column].dropna()
+            if values is None:
+                values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            sample_data = values[~np.isnan(values)]
             
             # Realizar prueba t
             t_stat, p_value = stats.ttest_1samp(sample_data, test_value)
@@ -43,7 +60,7 @@ class StatisticalAnalysis:
             # Calcular estadísticas descriptivas
             n = len(sample_data)
             mean = sample_data.mean()
-            std = sample_data.std()
+            std = sample_data.std(ddof=1)
             se = std / np.sqrt(n)
             
             # Intervalo de confianza
@@ -76,15 +93,30 @@ class StatisticalAnalysis:
         except Exception as e:
             return {'error': f"Error en prueba t de una muestra: {str(e)}"}
     
-    def t_test_two_samples(self, data, column, group_column, alpha=0.05, equal_var=True):
-        """Prueba t de dos muestras independientes"""
+    def _split_groups(self, data, column, group_column, group_indices=None):
+        """Separar los valores de `column` por grupo, en orden de aparición y sin NaN"""
+        if group_indices is None:
+            group_indices = data.groupby(group_column, sort=False, observed=True).indices
+        values = data[column].to_numpy(dtype=np.float64)
+        names, samples = [], []
+        for name, idx in group_indices.items():
+            sample = values[idx]
+            names.append(name)
+            samples.append(sample[~np.isnan(sample)])
+        return names, samples
+    
+    def t_test_two_samples(self, data, column, group_column, alpha=0.05, equal_var=True, group_indices=None):
+        """Prueba t de dos muestras independientes
+        
+        `group_indices` (opcional) es el resultado de `groupby(group_column).indices`,
+        para reutilizar una partición ya calculada por quien llama.
+        """
         try:
-            groups = data[group_column].unique()
+            groups, samples = self._split_groups(data, column, group_column, group_indices)
             if len(groups) != 2:
                 return {'error': 'La variable de agrupación debe tener exactamente 2 grupos'}
             
-            group1_data = data[data[group_column] == groups[0]][column].dropna()
-            group2_data = data[data[group_column] == groups[1]][column].dropna()
+            group1_data, group2_data = samples
             
             # Realizar prueba t
             if equal_var:
@@ -95,7 +127,7 @@ class StatisticalAnalysis:
             # Estadísticas descriptivas
             n1, n2 = len(group1_data), len(group2_data)
             mean1, mean2 = group1_data.mean(), group2_data.mean()
-            std1, std2 = group1_data.std(), group2_data.std()
+            std1, std2 = group1_data.std(ddof=1), group2_data.std(ddof=1)
             
             # Tamaño del efecto (Cohen's d)
             pooled_std = np.sqrt(((n1-1)*std1**2 + (n2-1)*std2**2) / (n1+n2-2))
@@ -124,15 +156,18 @@ class StatisticalAnalysis:
         except Exception as e:
             return {'error': f"Error en prueba t de dos muestras: {str(e)}"}
     
-    def anova_one_way(self, data, dependent_var, independent_var, alpha=0.05):
-        """ANOVA de un factor"""
+    def anova_one_way(self, data, dependent_var, independent_var, alpha=0.05, group_indices=None):
+        """ANOVA de un factor
+        
+        `group_indices` (opcional) es el resultado de `groupby(independent_var).indices`.
+        """
         try:
             # Preparar datos
             groups = []
             group_names = []
             
-            for group_name in data[independent_var].unique():
-                group_data = data[data[independent_var] == group_name][dependent_var].dropna()
+            names, samples = self._split_groups(data, dependent_var, independent_var, group_indices)
+            for group_name, group_data in zip(names, samples):
                 if len(group_data) > 0:
                     groups.append(group_data)
                     group_names.append(group_name)
@@ -150,14 +185,15 @@ class StatisticalAnalysis:
                     'group': group_names[i],
                     'n': len(group),
                     'mean': group.mean(),
-                    'std': group.std(),
+                    'std': group.std(ddof=1) if len(group) > 1 else np.nan,
                     'min': group.min(),
                     'max': group.max()
                 })
             
             # Eta cuadrado (tamaño del efecto)
-            ss_between = sum([len(group) * (group.mean() - data[dependent_var].mean())**2 for group in groups])
-            ss_total = sum([(x - data[dependent_var].mean())**2 for group in groups for x in group])
+            grand_mean = data[dependent_var].mean()
+            ss_between = sum(len(group) * (group.mean() - grand_mean)**2 for group in groups)
+            ss_total = sum(((group - grand_mean)**2).sum() for group in groups)
             eta_squared = ss_between / ss_total if ss_total > 0 else 0
             
             result = {
@@ -197,10 +233,8 @@ class StatisticalAnalysis:
                 'test_type': 'Prueba de chi-cuadrado de independencia',
                 'variable_1': var1,
                 'variable_2': var2,
-                'contingency_table': contingency_table.to_dict(),
-                'expected_frequencies': pd.DataFrame(expected, 
-                                                   index=contingency_table.index,
-                                                   columns=contingency_table.columns).to_dict(),
+                'contingency_table': self._table_payload(contingency_table.to_numpy(dtype=np.int64), contingency_table),
+                'expected_frequencies': self._table_payload(np.asarray(expected, dtype=np.float64), contingency_table),
                 'chi2_statistic': chi2,
                 'p_value': p_value,
                 'degrees_of_freedom': dof,
@@ -216,22 +250,123 @@ class StatisticalAnalysis:
         except Exception as e:
             return {'error': f"Error en prueba de chi-cuadrado: {str(e)}"}
     
-    def correlation_analysis(self, data, var1, var2, method='pearson', alpha=0.05):
-        """Análisis de correlación"""
+    def chi_square_matrix(self, data, columns, alpha=0.05):
+        """Chi-cuadrado de independencia para todas las parejas de variables categóricas
+        
+        Cada pareja usa su propia tabla de contingencia (k_i × k_j) construida con un
+        `bincount` sobre códigos enteros. Las columnas con menos de 2 o más de
+        `CHI_SQUARE_MAX_CATEGORIES` categorías se omiten. A diferencia de
+        `chi_square_test`, no se aplica la corrección de Yates en tablas 2×2.
+        """
+        try:
+            # Códigos enteros por columna (-1 para valores faltantes)
+            codes = []
+            kept = []
+            skipped = []
+            for col in columns:
+                col_codes = pd.Categorical(data[col]).codes.astype(np.int64)
+                k = int(col_codes.max()) + 1 if len(col_codes) else 0
+                if 2 <= k <= CHI_SQUARE_MAX_CATEGORIES:
+                    codes.append((col_codes, k))
+                    kept.append(col)
+                else:
+                    skipped.append(col)
+            
+            columns = kept
+            m = len(columns)
+            if m < 2:
+                return {'error': (
+                    'Se necesitan al menos 2 columnas categóricas con entre 2 y '
+                    f'{CHI_SQUARE_MAX_CATEGORIES} categorías'
+                )}
+            
+            pairs = [(i, j) for i in range(m) for j in range(i + 1, m)]
+            chi2 = np.empty(len(pairs), dtype=np.float64)
+            dof = np.empty(len(pairs), dtype=np.int64)
+            n = np.empty(len(pairs), dtype=np.float64)
+            min_dim = np.empty(len(pairs), dtype=np.int64)
+            for p, (i, j) in enumerate(pairs):
+                codes_i, k_i = codes[i]
+                codes_j, k_j = codes[j]
+                valid = (codes_i >= 0) & (codes_j >= 0)
+                packed = codes_i[valid] * k_j + codes_j[valid]
+                observed = np.bincount(packed, minlength=k_i * k_j).reshape(k_i, k_j).astype(np.float64)
+                
+                # Frecuencias esperadas y estadístico de la pareja
+                row_totals = observed.sum(axis=1)
+                col_totals = observed.sum(axis=0)
+                n[p] = row_totals.sum()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    expected = np.outer(row_totals, col_totals) / n[p]
+                    chi2[p] = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0).sum()
+                n_rows = int((row_totals > 0).sum())
+                n_cols = int((col_totals > 0).sum())
+                dof[p] = (n_rows - 1) * (n_cols - 1)
+                min_dim[p] = min(n_rows, n_cols)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                p_values = np.where(dof > 0, stats.chi2.sf(chi2, np.maximum(dof, 1)), np.nan)
+                cramers_v = np.sqrt(chi2 / (n * (min_dim - 1)))
+            
+            # Matrices simétricas (m × m) con la diagonal vacía
+            chi2_matrix = np.full((m, m), np.nan)
+            p_matrix = np.full((m, m), np.nan)
+            v_matrix = np.full((m, m), np.nan)
+            upper = tuple(np.array(pairs).T)
+            lower = upper[::-1]
+            for matrix, values in ((chi2_matrix, chi2), (p_matrix, p_values), (v_matrix, cramers_v)):
+                matrix[upper] = values
+                matrix[lower] = values
+            
+            result = {
+                'test_type': 'Chi-cuadrado (todas las parejas)',
+                'variables': columns,
+                'skipped_variables': skipped,
+                'n_pairs': len(pairs),
+                'chi2_matrix': chi2_matrix,
+                'p_value_matrix': p_matrix,
+                'cramers_v_matrix': v_matrix,
+                'alpha': alpha,
+                'significant_pairs': [
+                    (columns[i], columns[j]) for (i, j), p in zip(pairs, p_values) if p < alpha
+                ]
+            }
+            
+            self.results_history.append(result)
+            return result
+            
+        except Exception as e:
+            return {'error': f"Error en chi-cuadrado por parejas: {str(e)}"}
+    
+    def _table_payload(self, values, like):
+        """Tabla como {'index', 'columns', 'data'} con un ndarray 2D ya tipado"""
+        return {
+            'index': like.index.tolist(),
+            'columns': like.columns.tolist(),
+            'data': values
+        }
+    
+    def correlation_analysis(self, data, var1, var2, method='pearson', alpha=0.05, values=None):
+        """Análisis de correlación
+        
+        `values` (opcional) es un ndarray float64 de forma (n, 2) con las dos variables.
+        """
         try:
             # Filtrar datos válidos
-            valid_data = data[[var1, var2]].dropna()
+            if values is None:
+                values = data[[var1, var2]].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid_data = values[~np.isnan(values).any(axis=1)]
             
             if len(valid_data) < 3:
                 return {'error': 'Se necesitan al menos 3 observaciones válidas'}
             
             # Calcular correlación según el método
             if method == 'pearson':
-                corr_coef, p_value = pearsonr(valid_data[var1], valid_data[var2])
+                corr_coef, p_value = self._pearson_from_array(valid_data)
             elif method == 'spearman':
-                corr_coef, p_value = spearmanr(valid_data[var1], valid_data[var2])
+                corr_coef, p_value = spearmanr(valid_data[:, 0], valid_data[:, 1])
             elif method == 'kendall':
-                corr_coef, p_value = kendalltau(valid_data[var1], valid_data[var2])
+                corr_coef, p_value = kendalltau(valid_data[:, 0], valid_data[:, 1])
             else:
                 return {'error': 'Método no válido. Use: pearson, spearman, o kendall'}
             
@@ -258,6 +393,17 @@ class StatisticalAnalysis:
         except Exception as e:
             return {'error': f"Error en análisis de correlación: {str(e)}"}
     
+    def _pearson_from_array(self, arr):
+        """Correlación de Pearson y p-valor bilateral sobre un arreglo (n, 2) sin NaN"""
+        x = np.ascontiguousarray(arr[:, 0])
+        y = np.ascontiguousarray(arr[:, 1])
+        corr_coef, n = pearson_r(x, y)
+        corr_coef = float(corr_coef)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_stat = corr_coef * np.sqrt((n - 2) / (1.0 - corr_coef * corr_coef))
+        p_value = float(2 * stats.t.sf(abs(t_stat), n - 2))
+        return corr_coef, p_value
+    
     def linear_regression(self, data, dependent_var, independent_vars, alpha=0.05):
         """Análisis de regresión lineal"""
         try:
@@ -301,6 +447,10 @@ class StatisticalAnalysis:
                 'rmse': rmse,
                 'f_statistic': model.fvalue,
                 'f_p_value': model.f_pvalue,
+                'names': ['const'] + independent_vars,
+                'coefficients_arr': np.asarray(model.params, dtype=np.float64),
+                'p_values_arr': np.asarray(model.pvalues, dtype=np.float64),
+                'ci_arr': np.asarray(model.conf_int(), dtype=np.float64),
                 'coefficients': dict(zip(['const'] + independent_vars, model.params)),
                 'p_values': dict(zip(['const'] + independent_vars, model.pvalues)),
                 'confidence_intervals': dict(zip(['const'] + independent_vars, 
@@ -316,67 +466,183 @@ class StatisticalAnalysis:
         except Exception as e:
             return {'error': f"Error en regresión lineal: {str(e)}"}
     
-    def kmeans_clustering(self, data, variables, n_clusters=3, random_state=42):
-        """Análisis de clustering K-means"""
+    def linear_regression_fast(self, X, y, names, alpha=0.05, dependent_var=None):
+        """Regresión lineal por mínimos cuadrados (LAPACK) en float64
+        
+        `X` debe incluir la columna de unos del intercepto y no contener NaN;
+        `names` son los nombres de las columnas de `X` (empezando por 'const').
+        """
         try:
-            # Preparar datos
-            cluster_data = data[variables].dropna()
+            n, k = X.shape
+            if n < k + 1:
+                return {'error': 'Datos insuficientes para regresión'}
             
-            if len(cluster_data) < n_clusters:
-                return {'error': f'Se necesitan al menos {n_clusters} observaciones'}
+            # float64: con datos alejados de cero float32 pierde la inferencia por cancelación
+            X = np.asarray(X, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
             
-            # Estandarizar datos
-            scaler = StandardScaler()
-            scaled_data = scaler.fit_transform(cluster_data)
-            
-            # Aplicar K-means
-            kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
-            cluster_labels = kmeans.fit_predict(scaled_data)
-            
-            # Agregar etiquetas al dataframe original
-            result_data = cluster_data.copy()
-            result_data['cluster'] = cluster_labels
-            
-            # Calcular centroides en escala original
-            centroids_scaled = kmeans.cluster_centers_
-            centroids = scaler.inverse_transform(centroids_scaled)
-            
-            # Estadísticas por cluster
-            cluster_stats = []
-            for i in range(n_clusters):
-                cluster_subset = result_data[result_data['cluster'] == i]
-                stats_dict = {
-                    'cluster': i,
-                    'size': len(cluster_subset),
-                    'percentage': len(cluster_subset) / len(result_data) * 100
-                }
-                
-                for var in variables:
-                    stats_dict[f'{var}_mean'] = cluster_subset[var].mean()
-                    stats_dict[f'{var}_std'] = cluster_subset[var].std()
-                
-                cluster_stats.append(stats_dict)
+            # Coeficientes por lstsq (DGELSD)
+            coefs, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
             
-            # Inercia (suma de distancias cuadradas a centroides)
-            inertia = kmeans.inertia_
+            # Residuos y métricas
+            residuals = y - X @ coefs
+            sse = float(residuals @ residuals)
+            sst = float(((y - y.mean()) ** 2).sum())
+            dof = n - k
+            
+            r_squared = 1 - sse / sst if sst > 0 else 0.0
+            adj_r_squared = 1 - (1 - r_squared) * (n - 1) / dof
+            mse = sse / n
+            rmse = np.sqrt(mse)
+            
+            # Errores estándar: diag((X'X)^-1) * sigma^2, con (X'X)^-1 = R^-1 R^-T de la QR de X
+            # (sin formar X'X, que duplica el número de condición)
+            sigma2 = sse / dof
+            r_inv = np.linalg.pinv(np.linalg.qr(X, mode='r'))
+            std_errors = np.sqrt((r_inv ** 2).sum(axis=1) * sigma2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t_values = coefs / std_errors
+            p_values = 2 * stats.t.sf(np.abs(t_values), dof)
+            # IC 95% como el conf_int() de statsmodels y la etiqueta de la tabla; alpha solo
+            # decide la significancia
+            t_crit = stats.t.ppf(0.975, dof)
+            conf_int = np.column_stack([coefs - t_crit * std_errors, coefs + t_crit * std_errors])
+            
+            # Prueba F global
+            if k > 1 and sse > 0:
+                f_statistic = ((sst - sse) / (k - 1)) / sigma2
+                f_p_value = float(stats.f.sf(f_statistic, k - 1, dof))
+            elif k > 1 and sst > 0:
+                # Ajuste perfecto: el modelo explica toda la variación
+                f_statistic, f_p_value = np.inf, 0.0
+            else:
+                f_statistic, f_p_value = np.nan, 1.0
             
             result = {
-                'analysis_type': 'K-means Clustering',
-                'variables': variables,
-                'n_clusters': n_clusters,
-                'sample_size': len(cluster_data),
-                'cluster_labels': cluster_labels.tolist(),
-                'centroids': centroids.tolist(),
-                'cluster_statistics': cluster_stats,
-                'inertia': inertia,
-                'data_with_clusters': result_data.to_dict('records')
+                'test_type': 'Regresión lineal',
+                'dependent_variable': dependent_var,
+                'independent_variables': list(names[1:]),
+                'sample_size': n,
+                'r_squared': r_squared,
+                'adj_r_squared': adj_r_squared,
+                'mse': mse,
+                'rmse': rmse,
+                'f_statistic': f_statistic,
+                'f_p_value': f_p_value,
+                'names': list(names),
+                'coefficients_arr': coefs,
+                'p_values_arr': p_values,
+                'ci_arr': conf_int,
+                'coefficients': dict(zip(names, coefs)),
+                'p_values': dict(zip(names, p_values)),
+                'confidence_intervals': dict(zip(names, conf_int.tolist())),
+                'is_significant': f_p_value < alpha,
+                'interpretation': self._interpret_regression(r_squared, f_p_value, alpha)
             }
             
             self.results_history.append(result)
             return result
             
+        except Exception as e:
+            return {'error': f"Error en regresión lineal: {str(e)}"}
+    
+    def kmeans_clustering(self, data, variables, n_clusters=3, random_state=42, skip_scaler=False):
+        """Análisis de clustering K-means"""
+        try:
+            model = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+            result = self._fit_clustering(data, variables, n_clusters, model, 'K-means Clustering', skip_scaler)
         except Exception as e:
             return {'error': f"Error en clustering K-means: {str(e)}"}
+        
+        if 'error' not in result:
+            self.results_history.append(result)
+        return result
+    
+    def minibatch_kmeans_clustering(self, data, variables, n_clusters=3, batch_size=1024, n_init=3, random_state=42,
+                                    skip_scaler=False):
+        """Clustering K-means por mini-lotes, pensado para conjuntos grandes (> 10k filas)"""
+        try:
+            model = MiniBatchKMeans(
+                n_clusters=n_clusters, batch_size=batch_size, n_init=n_init, random_state=random_state
+            )
+            result = self._fit_clustering(
+                data, variables, n_clusters, model, 'K-means Clustering (Mini-Batch)', skip_scaler
+            )
+        except Exception as e:
+            return {'error': f"Error en clustering K-means: {str(e)}"}
+        
+        if 'error' not in result:
+            self.results_history.append(result)
+        return result
+    
+    def _fit_clustering(self, data, variables, n_clusters, model, analysis_type, skip_scaler=False):
+        """Ajustar un modelo tipo K-means sobre las variables estandarizadas y resumir los clusters
+        
+        Con `skip_scaler=True` (variables ya en escalas comparables) se ajusta sobre los
+        datos solo centrados y se evita StandardScaler.
+        """
+        # Preparar datos
+        cluster_data = data[variables].dropna()
+        
+        if len(cluster_data) < n_clusters:
+            return {'error': f'Se necesitan al menos {n_clusters} observaciones'}
+        
+        X = cluster_data.to_numpy(dtype=np.float64)
+        
+        # Estandarizar datos en float64 (media y varianza pierden precisión en float32 con
+        # datos alejados de cero); solo la matriz ya escalada pasa a float32 contiguo, la
+        # mitad de ancho de banda en el cálculo de distancias
+        if skip_scaler:
+            # Sin escalar pero centrado: restar la media en float64 conserva los dígitos
+            # que float32 perdería con datos alejados de cero (p. ej. años o coordenadas)
+            scaler = None
+            center = X.mean(axis=0)
+            scaled_data = np.ascontiguousarray(X - center, dtype=np.float32)
+        else:
+            scaler = StandardScaler()
+            scaled_data = np.ascontiguousarray(scaler.fit_transform(X), dtype=np.float32)
+        
+        # Aplicar el modelo
+        cluster_labels = model.fit_predict(scaled_data)
+        
+        # Agregar etiquetas al dataframe original
+        result_data = cluster_data.copy()
+        result_data['cluster'] = cluster_labels
+        
+        # Calcular centroides en escala original (float64)
+        centroids_scaled = model.cluster_centers_.astype(np.float64)
+        centroids = centroids_scaled + center if scaler is None else scaler.inverse_transform(centroids_scaled)
+        
+        # Estadísticas por cluster
+        cluster_stats = []
+        for i in range(n_clusters):
+            cluster_subset = result_data[result_data['cluster'] == i]
+            stats_dict = {
+                'cluster': i,
+                'size': len(cluster_subset),
+                'percentage': len(cluster_subset) / len(result_data) * 100
+            }
+            
+            for var in variables:
+                stats_dict[f'{var}_mean'] = cluster_subset[var].mean()
+                stats_dict[f'{var}_std'] = cluster_subset[var].std()
+            
+            cluster_stats.append(stats_dict)
+        
+        # Inercia (suma de distancias cuadradas a centroides)
+        inertia = model.inertia_
+        
+        return {
+            'analysis_type': analysis_type,
+            'variables': variables,
+            'n_clusters': n_clusters,
+            'sample_size': len(cluster_data),
+            'cluster_labels': cluster_labels.tolist(),
+            'centroids': centroids.tolist(),
+            'cluster_statistics': cluster_stats,
+            'inertia': inertia,
+            'data_with_clusters': result_data.to_dict('records')
+        }
     
     def create_statistical_visualizations(self, result, data=None):
         """Crear visualizaciones para resultados estadísticos"""
@@ -481,6 +747,10 @@ class StatisticalAnalysis:
         # Implementar visualización para clustering
         return None
     
+    def add_to_history(self, result):
+        """Registrar en el historial un resultado calculado fuera del analizador (p. ej. desde caché)"""
+        self.results_history.append(result)
+    
     def get_analysis_history(self):
         """Obtener historial de análisis"""
         return self.results_history
@@ -497,7 +767,7 @@ class StatisticalAnalysis:
             return pd.DataFrame([results])
         elif format == 'json':
             import json
-            return json.dumps(results, indent=2, default=str)
+            return json.dumps(results, indent=2, default=_json_default)
         else:
             return results
 
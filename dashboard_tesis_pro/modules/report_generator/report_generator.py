@@ -50,6 +50,9 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+# Buffer de 1 MiB para escribir reportes grandes en pocas llamadas al sistema
+IO_BUFFER_SIZE = 1 << 20
+
 class ProfessionalReportGenerator:
     """Generador de informes profesionales para análisis de datos"""
     
@@ -271,7 +274,7 @@ class ProfessionalReportGenerator:
             filepath = os.path.join(self.exports_dir, filename)
             
             # Guardar archivo
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with open(filepath, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
                 f.write(html_content)
             
             return {
@@ -418,7 +421,7 @@ class ProfessionalReportGenerator:
             filepath = os.path.join(self.exports_dir, filename)
             
             # Guardar archivo
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with open(filepath, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
                 f.write(markdown_content)
             
             return {
@@ -19,10 +19,15 @@ from datetime import datetime
 import requests
 import io
 import zipfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from typing import Dict, List, Any
 
 # Importar el generador de reportes
-from report_generator import ProfessionalReportGenerator
+from report_generator import ProfessionalReportGenerator, IO_BUFFER_SIZE
 
 # Configuración de la página
 st.set_page_config(
@@ -95,14 +100,60 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+@dataclass(slots=True)
+class ReportRecord:
+    """Entrada del historial de reportes generados"""
+    title: str
+    type: str
+    format: str
+    filename: str
+    filepath: str
+    success: bool
+    timestamp: str
+    size_bytes: int
+    size_human: str
+
+
+def _column_type_masks(data: pd.DataFrame):
+    """Máscaras booleanas de columnas numéricas y categóricas sin materializar sub-DataFrames"""
+    dtypes = data.dtypes
+    numeric_mask = np.fromiter(
+        (pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in dtypes),
+        dtype=bool, count=len(dtypes)
+    )
+    categorical_mask = np.fromiter(
+        (pd.api.types.is_object_dtype(t) or isinstance(t, pd.CategoricalDtype) for t in dtypes),
+        dtype=bool, count=len(dtypes)
+    )
+    return numeric_mask, categorical_mask
+
+
+def _unlink_quietly(path: str):
+    """Eliminar un archivo ignorando errores (ya eliminado, permisos, etc.)"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _delete_file_in_background(path: str):
+    """Eliminar un archivo en un hilo aparte para no bloquear la interfaz"""
+    if path:
+        threading.Thread(target=_unlink_quietly, args=(path,), daemon=True).start()
+
+
 class StreamlitReportInterface:
     def __init__(self):
         self.file_api_url = "http://localhost:8060/api"
         self.report_generator = ProfessionalReportGenerator()
         
         # Inicializar estado de sesión
+        # Historial indexado por id: eliminar una entrada es O(1)
         if 'report_history' not in st.session_state:
-            st.session_state.report_history = []
+            st.session_state.report_history = OrderedDict()
         
         if 'current_data' not in st.session_state:
             st.session_state.current_data = None
@@ -264,6 +315,12 @@ class StreamlitReportInterface:
             else:
                 st.sidebar.error("❌ Carga datos primero")
         
+        if st.sidebar.button("🚀 Generar Todos"):
+            if st.session_state.current_data is not None:
+                self.generate_all_quick_reports()
+            else:
+                st.sidebar.error("❌ Carga datos primero")
+        
         # Configuración rápida
         st.sidebar.markdown("---")
         st.sidebar.subheader("⚙️ Configuración Rápida")
@@ -756,6 +813,7 @@ class StreamlitReportInterface:
         if st.button("👁️ Generar Vista Previa", type="primary"):
             with st.spinner("Generando vista previa..."):
                 preview_content = self.generate_preview(preview_type)
+                preview_ts = self.get_preview_timestamp(preview_type)
                 
                 if preview_content:
                     st.markdown("### 📄 Vista Previa del Reporte")
@@ -770,7 +828,7 @@ class StreamlitReportInterface:
                         st.download_button(
                             label="⬇️ Descargar HTML",
                             data=preview_content,
-                            file_name=f"vista_previa_{preview_type}_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
+                            file_name=f"vista_previa_{preview_type}_{preview_ts}.html",
                             mime="text/html"
                         )
                     
@@ -798,71 +856,66 @@ class StreamlitReportInterface:
             st.metric("📄 Total Reportes", len(st.session_state.report_history))
         
         with col2:
-            formats = [report.get('format', 'unknown') for report in st.session_state.report_history]
+            formats = [report.format for report in st.session_state.report_history.values()]
             most_common_format = max(set(formats), key=formats.count) if formats else 'N/A'
             st.metric("📊 Formato Más Usado", most_common_format.upper())
         
         with col3:
-            types = [report.get('type', 'unknown') for report in st.session_state.report_history]
+            types = [report.type for report in st.session_state.report_history.values()]
             most_common_type = max(set(types), key=types.count) if types else 'N/A'
             st.metric("📋 Tipo Más Usado", most_common_type.title())
         
         with col4:
             if st.button("🗑️ Limpiar Historial"):
-                st.session_state.report_history = []
+                st.session_state.report_history = OrderedDict()
                 st.success("✅ Historial limpiado")
                 st.rerun()
         
         # Lista de reportes
         st.markdown("### 📋 Reportes Generados")
         
-        for i, report in enumerate(reversed(st.session_state.report_history)):
-            with st.expander(f"📄 {report.get('title', f'Reporte #{len(st.session_state.report_history)-i}')}"):
+        for i, (report_id, report) in enumerate(reversed(st.session_state.report_history.items())):
+            with st.expander(f"📄 {report.title or f'Reporte #{len(st.session_state.report_history)-i}'}"):
                 
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown(f"**Tipo:** {report.get('type', 'N/A').title()}")
-                    st.markdown(f"**Formato:** {report.get('format', 'N/A').upper()}")
-                    st.markdown(f"**Archivo:** {report.get('filename', 'N/A')}")
+                    st.markdown(f"**Tipo:** {report.type.title()}")
+                    st.markdown(f"**Formato:** {report.format.upper()}")
+                    st.markdown(f"**Archivo:** {report.filename}")
                 
                 with col2:
-                    st.markdown(f"**Generado:** {report.get('timestamp', 'N/A')}")
-                    st.markdown(f"**Tamaño:** {report.get('size_human', 'N/A')}")
-                    st.markdown(f"**Estado:** {'✅ Exitoso' if report.get('success', False) else '❌ Error'}")
+                    st.markdown(f"**Generado:** {report.timestamp}")
+                    st.markdown(f"**Tamaño:** {report.size_human}")
+                    st.markdown(f"**Estado:** {'✅ Exitoso' if report.success else '❌ Error'}")
                 
                 # Botones de acción
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    if report.get('filepath') and os.path.exists(report['filepath']):
-                        with open(report['filepath'], 'rb') as f:
+                    if report.filepath and os.path.exists(report.filepath):
+                        with open(report.filepath, 'rb', buffering=IO_BUFFER_SIZE) as f:
                             st.download_button(
                                 label="⬇️ Descargar",
                                 data=f.read(),
-                                file_name=report.get('filename', 'reporte'),
-                                mime=self.get_mime_type(report.get('format', 'html')),
-                                key=f"download_{i}"
+                                file_name=report.filename or 'reporte',
+                                mime=self.get_mime_type(report.format),
+                                key=f"download_{report_id}"
                             )
                     else:
-                        st.button("❌ No disponible", disabled=True, key=f"unavailable_{i}")
+                        st.button("❌ No disponible", disabled=True, key=f"unavailable_{report_id}")
                 
                 with col2:
-                    if st.button("🔄 Regenerar", key=f"regenerate_{i}"):
+                    if st.button("🔄 Regenerar", key=f"regenerate_{report_id}"):
                         st.info("🚧 Funcionalidad de regeneración en desarrollo")
                 
                 with col3:
-                    if st.button("🗑️ Eliminar", key=f"delete_{i}"):
+                    if st.button("🗑️ Eliminar", key=f"delete_{report_id}"):
                         # Eliminar del historial
-                        actual_index = len(st.session_state.report_history) - 1 - i
-                        del st.session_state.report_history[actual_index]
+                        del st.session_state.report_history[report_id]
                         
-                        # Eliminar archivo si existe
-                        if report.get('filepath') and os.path.exists(report['filepath']):
-                            try:
-                                os.remove(report['filepath'])
-                            except:
-                                pass
+                        # Eliminar archivo en segundo plano
+                        _delete_file_in_background(report.filepath)
                         
                         st.success("✅ Reporte eliminado")
                         st.rerun()
@@ -892,7 +945,7 @@ class StreamlitReportInterface:
                 st.success(f"✅ Reporte ejecutivo generado: {result['filename']}")
                 
                 # Botón de descarga
-                with open(result['filepath'], 'rb') as f:
+                with open(result['filepath'], 'rb', buffering=IO_BUFFER_SIZE) as f:
                     st.download_button(
                         label="⬇️ Descargar Reporte Ejecutivo",
                         data=f.read(),
@@ -928,7 +981,7 @@ class StreamlitReportInterface:
                 st.success(f"✅ Reporte técnico generado: {result['filename']}")
                 
                 # Botón de descarga
-                with open(result['filepath'], 'rb') as f:
+                with open(result['filepath'], 'rb', buffering=IO_BUFFER_SIZE) as f:
                     st.download_button(
                         label="⬇️ Descargar Reporte Técnico",
                         data=f.read(),
@@ -962,7 +1015,7 @@ class StreamlitReportInterface:
                 st.success(f"✅ Dashboard generado: {result['filename']}")
                 
                 # Botón de descarga
-                with open(result['filepath'], 'rb') as f:
+                with open(result['filepath'], 'rb', buffering=IO_BUFFER_SIZE) as f:
                     st.download_button(
                         label="⬇️ Descargar Dashboard",
                         data=f.read(),
@@ -972,6 +1025,69 @@ class StreamlitReportInterface:
             else:
                 st.error(f"❌ Error al generar dashboard: {result['error']}")
     
+    def generate_all_quick_reports(self):
+        """Generar los tres reportes rápidos en paralelo"""
+        if st.session_state.current_data is None:
+            return
+        
+        with st.spinner("Generando todos los reportes..."):
+            data = st.session_state.current_data
+            config = st.session_state.report_config
+            
+            # Los datos de entrada se preparan en el hilo de Streamlit;
+            # los hilos de trabajo solo renderizan plantillas y escriben archivos
+            jobs = {
+                'executive': (
+                    'Reporte Ejecutivo Rápido',
+                    self.report_generator.generate_executive_summary,
+                    dict(
+                        data=data,
+                        key_findings=self.generate_basic_findings(data),
+                        recommendations=self.generate_basic_recommendations(data),
+                        config=config
+                    )
+                ),
+                'technical': (
+                    'Reporte Técnico Completo',
+                    self.report_generator.generate_technical_report,
+                    dict(
+                        data=data,
+                        statistical_tests=self.prepare_statistical_tests(data),
+                        visualizations=self.prepare_visualizations_data(data),
+                        methodology=self.generate_methodology_description(data),
+                        config=config
+                    )
+                ),
+                'dashboard': (
+                    'Dashboard Interactivo',
+                    self.report_generator.generate_dashboard_report,
+                    dict(
+                        data=data,
+                        charts=self.prepare_dashboard_charts(data),
+                        metrics=self.prepare_dashboard_metrics(data),
+                        config=config
+                    )
+                )
+            }
+            
+            results = {}
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = {
+                    executor.submit(generate, **kwargs): report_type
+                    for report_type, (_, generate, kwargs) in jobs.items()
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        
+        # Registrar en el historial en orden estable
+        for report_type, (title, _, _) in jobs.items():
+            result = results[report_type]
+            if result['success']:
+                self.add_to_history(result, report_type, title)
+                st.success(f"✅ {title} generado: {result['filename']}")
+            else:
+                st.error(f"❌ Error al generar {title.lower()}: {result['error']}")
+    
     # Métodos auxiliares
     def generate_basic_findings(self, data: pd.DataFrame) -> List[str]:
         """Generar hallazgos básicos automáticamente"""
@@ -988,8 +1104,9 @@ class StreamlitReportInterface:
             findings.append(f"Se identificaron {missing_pct:.1f}% de valores faltantes que requieren atención.")
         
         # Hallazgo sobre tipos de variables
-        numeric_cols = len(data.select_dtypes(include=[np.number]).columns)
-        categorical_cols = len(data.select_dtypes(include=['object', 'category']).columns)
+        numeric_mask, categorical_mask = _column_type_masks(data)
+        numeric_cols = int(numeric_mask.sum())
+        categorical_cols = int(categorical_mask.sum())
         
         if numeric_cols > categorical_cols:
             findings.append("El dataset es predominantemente numérico, ideal para análisis estadísticos avanzados.")
@@ -1008,8 +1125,8 @@ class StreamlitReportInterface:
             recommendations.append(f"Implementar estrategias de imputación para las columnas con valores faltantes: {', '.join(missing_cols[:3])}")
         
         # Recomendación sobre análisis adicionales
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) >= 2:
+        numeric_mask, _ = _column_type_masks(data)
+        if numeric_mask.sum() >= 2:
             recommendations.append("Realizar análisis de correlación entre variables numéricas para identificar relaciones significativas.")
         
         # Recomendación sobre visualizaciones
@@ -1017,32 +1134,41 @@ class StreamlitReportInterface:
         
         return recommendations
     
+    def get_preview_timestamp(self, preview_type: str) -> str:
+        """Obtener marca de tiempo de la vista previa, fija mientras no cambien los datos"""
+        data_id = id(st.session_state.current_data)
+        cached = st.session_state.get('preview_timestamps', {}).get(preview_type)
+        if cached is None or cached[0] != data_id:
+            cached = (data_id, datetime.now().strftime('%Y%m%d_%H%M'))
+            st.session_state.setdefault('preview_timestamps', {})[preview_type] = cached
+        return cached[1]
+    
     def add_to_history(self, result: Dict[str, Any], report_type: str, title: str):
         """Agregar reporte al historial"""
-        history_entry = {
-            'title': title,
-            'type': report_type,
-            'format': result['format'],
-            'filename': result['filename'],
-            'filepath': result['filepath'],
-            'success': result['success'],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'size_bytes': result.get('size_bytes', 0),
-            'size_human': self.format_file_size(result.get('size_bytes', 0))
-        }
+        generated_at = datetime.now()
+        size_bytes = result.get('size_bytes', 0)
+        history_entry = ReportRecord(
+            title=title,
+            type=report_type,
+            format=result['format'],
+            filename=result['filename'],
+            filepath=result['filepath'],
+            success=result['success'],
+            timestamp=generated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            size_bytes=size_bytes,
+            size_human=self.format_file_size(size_bytes)
+        )
         
-        st.session_state.report_history.append(history_entry)
+        st.session_state.report_history[uuid.uuid4().hex] = history_entry
     
     def format_file_size(self, size_bytes: int) -> str:
         """Formatear tamaño de archivo"""
-        if size_bytes < 1024:
+        size_bytes = int(size_bytes)
+        # Cada unidad equivale a 10 bits más: el índice sale de bit_length
+        unit_index = min(max((size_bytes.bit_length() - 1) // 10, 0), len(SIZE_UNITS) - 1)
+        if unit_index == 0:
             return f"{size_bytes} B"
-        elif size_bytes < 1024**2:
-            return f"{size_bytes/1024:.1f} KB"
-        elif size_bytes < 1024**3:
-            return f"{size_bytes/(1024**2):.1f} MB"
-        else:
-            return f"{size_bytes/(1024**3):.1f} GB"
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {SIZE_UNITS[unit_index]}"
     
     def get_mime_type(self, format_type: str) -> str:
         """Obtener tipo MIME según el formato"""
@@ -1098,7 +1224,7 @@ class StreamlitReportInterface:
             'total_records': len(data),
             'total_columns': len(data.columns),
             'missing_percentage': (data.isnull().sum().sum() / (len(data) * len(data.columns))) * 100,
-            'numeric_columns': len(data.select_dtypes(include=[np.number]).columns)
+            'numeric_columns': int(_column_type_masks(data)[0].sum())
         }
     
     def generate_preview(self, preview_type: str) -> str: